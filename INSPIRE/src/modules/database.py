@@ -34,6 +34,7 @@ Email: consulta@cnig.es
 
 """
 import copy
+import io
 import json
 import logging
 from pathlib import Path
@@ -53,6 +54,8 @@ DB_CONFIG_SCHEMA = Schema({
     'username': And(Use(str)),
     'password': And(Use(str)),
 })
+# Characters that must be escaped in the text format of COPY
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
 
 class GeoDBManager:
     """
@@ -70,6 +73,8 @@ class GeoDBManager:
             Logs a message at the specified logging level. If no logger is available, prints the message to the console.
         connect(config: Optional[Dict[str, Any]] = None) -> None:
             Establishes a connection to a PostgreSQL database using credentials provided in the `config` dictionary or from environment variables.
+        close() -> None:
+            Closes the cursor and the connection to the database.
         get_schemas() -> Dict[str, List[str]]:
             Retrieves all schemas and their tables from the database, returning them as a dictionary.
         table_exists(schema: str, table_name: str) -> bool:
@@ -84,8 +89,20 @@ class GeoDBManager:
             Maps OGR field types to PostgreSQL types.
         add_feature_to_table(schema: str, table_name: str, feature: ogr.Feature) -> None:
             Adds a feature from an OGR data source to a PostgreSQL table, creating the table if it does not exist.
+        add_features_to_table(schema: str, table_name: str, features: List[ogr.Feature]) -> None:
+            Adds a batch of features to a PostgreSQL table with a single `COPY` and a single commit.
+        _get_copy_statement(schema: str, table_name: str) -> Tuple[str, str]:
+            Gets the qualified name and the `COPY` statement of a table, built once per table.
+        _get_feature_rows(feature: ogr.Feature) -> List[Tuple[Dict[str, Any], Optional[int]]]:
+            Builds the rows to insert for a feature, one per value of its multi-value fields.
+        _format_copy_row(columns: Dict[str, Any], SRID: Optional[int]) -> str:
+            Formats the values of a row as a line of the text format of `COPY`.
         _add_row_to_table(table_name: str, columns: Dict[str, str], SRID: int) -> None:
             Inserts a row into a PostgreSQL table, handling WKT geometries appropriately.
+        _execute_insert(table_name: str, row: str) -> None:
+            Executes and commits the insertion of a single formatted row.
+        _format_row(columns: Dict[str, str], SRID: int) -> str:
+            Formats the values of a row as SQL, handling WKT geometries appropriately.
         is_wkt(column_value: str) -> bool:
             Determines if a given string represents a Well-Known Text (WKT) geometry.
         get_table_data(table_name: str, columns: List[str], key_column: str) -> List[Dict[str, str]]:
@@ -104,6 +121,7 @@ class GeoDBManager:
     _cursor:psycopg2.extensions.cursor | None = None
     logger:logging.Logger = logging.getLogger(__name__)  # Obtain a logger for this module/class
     schemas: Dict
+    _copy_statements: Dict[Tuple[str, str], Tuple[str, str]] = {}  # Qualified name and COPY statement of each table
     
     def __init__(self, db_config:Optional[Dict[str, Any]] = None) -> None:
         """
@@ -219,6 +237,20 @@ class GeoDBManager:
                 GeoDBManager.log(f"Database connection failed: {e}", logging.ERROR)
                 raise
 
+    @classmethod
+    def close(cls) -> None:
+        """
+        Closes the cursor and the connection to the database, if they are open.
+
+        Uncommitted changes are discarded, as `psycopg2` rolls back the open transaction when the connection is closed.
+        """
+        if cls._cursor:
+            connection = cls._cursor.connection
+            cls._cursor.close()
+            connection.close()
+            cls._cursor = None
+            GeoDBManager.log("Database connection closed.", logging.INFO)
+
     def get_schemas(self) -> None:
         """
         Get all the schemas and tables from each schema contained in the database in the form of a dict and 
@@ -434,63 +466,153 @@ class GeoDBManager:
             >>> feature = ogr_feature_from_somewhere()  # Get the OGR feature
             >>> self.add_feature_to_table(schema='public', table_name='places', feature=feature)
         """
+        self.add_features_to_table(schema, table_name, [feature])
+
+    def add_features_to_table(self, schema:str, table_name:str , features:List[ogr.Feature]) -> None:
+        """
+        Add a batch of features from an OGR data source to a PostgreSQL table, creating the table if it does not exist.
+
+        The rows of all the features (including the extra rows of multi-value fields) are streamed to the table
+        with a single `COPY ... FROM STDIN`, the fastest way to load data into PostgreSQL, and committed once.
+        Geometries are sent as EWKT (`SRID=<srid>;<wkt>`), which PostGIS parses directly. If the batch cannot be
+        copied, the transaction is rolled back and the rows are inserted one by one, so a single invalid row does
+        not discard the rest of the batch.
+
+        Parameters:
+            schema (str): The schema where the table resides. If the schema or table doesn't exist, the table will be created.
+            table_name (str): The name of the table to which the features will be added.
+            features (List[ogr.Feature]): The features to be inserted into the table. All of them must share the same fields.
+
+        Raises:
+            psycopg2.Error: Raised if there is any issue with the PostgreSQL connection.
+        """
+        if not features:
+            return
         if self._cursor:
             if not self.table_exists(schema, table_name):
-                if self.create_table_from_feature(f'"{schema}".{table_name}', feature):
+                if self.create_table_from_feature(f'"{schema}".{table_name}', features[0]):
                     self.log(f"Table '{table_name}' created successfully in schema '{schema}'.")
-                    
-            epsg_code = int(feature.GetDefnRef().GetGeomFieldDefn(0).srs.GetAttrValue('AUTHORITY', 1)) if feature.GetDefnRef().GetGeomFieldDefn(0) else None
-            
-            multivalue_fields = {}
-            count = 0
-            for index in range(feature.GetFieldCount()):
-                # Get field name and value
-                field_name = feature.GetFieldDefnRef(index).GetName()
-                field_value = feature.GetField(index)
-                
-                # Check if the field has multiple values
-                if isinstance(field_value, str):
-                    # Check for a pattern like "(n:value1,value2,...)" indicating multiple values
-                    if field_value.startswith('(') and ':' in field_value:
-                        # This looks like it could be a multi-value field (e.g., '(2:Latn,Latn)')
-                        _, values = field_value.strip('()').split(':', 1)
-                        values = values.split(',')
-                        if len(values) > 0:
-                            count = len(values)
-                        multivalue_fields[field_name] = values
-                if isinstance(field_value, list):
-                    if len(field_value) > 0:
-                        count = len(field_value)
-                    multivalue_fields[field_name] = field_value
-                
-            # Extract properties and geometry from the feature
-            properties = json.loads(feature.ExportToJson()).get('properties')
-            properties['geom'] = feature.geometry().ExportToWkt()
-            
-            # Handle multi-value fields by inserting multiple rows
-            if count > 0:
-                for index in range(count):
-                    properties_copy = copy.deepcopy(properties)
-                    for field_name, field_values in multivalue_fields.items():
-                        try:
-                            properties_copy[field_name] = field_values[index]
-                        except IndexError:
-                            properties_copy[field_name] = None
-                    self._add_row_to_table(table_name=f'"{schema}".{table_name}', columns=properties_copy, SRID=epsg_code)
-            else:
-                self._add_row_to_table(table_name=f'"{schema}".{table_name}', columns=properties, SRID=epsg_code)
-                
+
+            full_table_name, copy_statement = self._get_copy_statement(schema, table_name)
+            rows = [row for feature in features for row in self._get_feature_rows(feature)]
+            buffer = io.StringIO()
+            buffer.writelines(self._format_copy_row(columns, SRID) for columns, SRID in rows)
+            buffer.seek(0)
+            self.log(f'Copying {len(rows)} rows into table {full_table_name}.', logging.DEBUG)
+            try:
+                # COPY loads every row or raises, in which case the rows are inserted one by one below
+                self._cursor.copy_expert(copy_statement, buffer)
+                self._save_changes()
+            except Exception as e:
+                self.log(f'Error during the copy of {len(rows)} rows into table {full_table_name}, inserting them one by one.', logging.ERROR)
+                self.log(e, logging.ERROR)
+                self._rollback()
+                for columns, SRID in rows:
+                    self._add_row_to_table(full_table_name, columns, SRID)
         else:
             self.log("No database cursor available.", logging.WARNING)
+
+    @classmethod
+    def _get_copy_statement(cls, schema:str, table_name:str) -> Tuple[str, str]:
+        """
+        Get the qualified name of a table and the `COPY` statement that loads it, building them only once per table.
+
+        Parameters:
+            schema (str): The schema where the table resides.
+            table_name (str): The name of the table.
+
+        Returns:
+            Tuple[str, str]: The qualified name of the table and its `COPY ... FROM STDIN` statement.
+        """
+        key = (schema, table_name)
+        statement = cls._copy_statements.get(key)
+        if statement is None:
+            full_table_name = f'"{schema}".{table_name}'
+            statement = cls._copy_statements[key] = (full_table_name, f'COPY {full_table_name} FROM STDIN')
+        return statement
+
+    def _get_feature_rows(self, feature:ogr.Feature) -> List[Tuple[Dict[str, Any], Optional[int]]]:
+        """
+        Build the rows to insert for a feature, handling multi-value fields by creating one row per value.
+
+        Parameters:
+            feature (ogr.Feature): The feature whose properties and geometry will be inserted.
+
+        Returns:
+            List[Tuple[Dict[str, Any], Optional[int]]]: The columns of each row along with the SRID of the geometry.
+        """
+        epsg_code = int(feature.GetDefnRef().GetGeomFieldDefn(0).srs.GetAttrValue('AUTHORITY', 1)) if feature.GetDefnRef().GetGeomFieldDefn(0) else None
+        
+        multivalue_fields = {}
+        count = 0
+        for index in range(feature.GetFieldCount()):
+            # Get field name and value
+            field_name = feature.GetFieldDefnRef(index).GetName()
+            field_value = feature.GetField(index)
+            
+            # Check if the field has multiple values
+            if isinstance(field_value, str):
+                # Check for a pattern like "(n:value1,value2,...)" indicating multiple values
+                if field_value.startswith('(') and ':' in field_value:
+                    # This looks like it could be a multi-value field (e.g., '(2:Latn,Latn)')
+                    _, values = field_value.strip('()').split(':', 1)
+                    values = values.split(',')
+                    if len(values) > 0:
+                        count = len(values)
+                    multivalue_fields[field_name] = values
+            if isinstance(field_value, list):
+                if len(field_value) > 0:
+                    count = len(field_value)
+                multivalue_fields[field_name] = field_value
+            
+        # Extract properties and geometry from the feature
+        properties = json.loads(feature.ExportToJson()).get('properties')
+        properties['geom'] = feature.geometry().ExportToWkt()
+        
+        # Handle multi-value fields by creating multiple rows
+        if count > 0:
+            rows = []
+            for index in range(count):
+                properties_copy = copy.deepcopy(properties)
+                for field_name, field_values in multivalue_fields.items():
+                    try:
+                        properties_copy[field_name] = field_values[index]
+                    except IndexError:
+                        properties_copy[field_name] = None
+                rows.append((properties_copy, epsg_code))
+            return rows
+        return [(properties, epsg_code)]
                 
+    def _format_copy_row(self, columns: Dict[str, Any], SRID:Optional[int]) -> str:
+        """
+        Format the values of a row as a line of the text format of `COPY`.
+
+        Values are separated by tabs, null values are written as `\\N` and special characters are escaped.
+        WKT geometries are prefixed with their SRID so they are loaded as EWKT. The `columns` are not modified.
+
+        Parameters:
+            columns (Dict[str, Any]): A dictionary of column names and their corresponding values to be inserted.
+            SRID (Optional[int]): The spatial reference ID (SRID) for the geometry.
+
+        Returns:
+            str: The line of the row, ending with a newline.
+        """
+        values = []
+        for value in columns.values():
+            if value is None:
+                values.append('\\N')
+            elif isinstance(value, str):
+                if SRID is not None and self.is_wkt(value):
+                    value = f'SRID={SRID};{value}'
+                values.append(value.translate(COPY_ESCAPES))
+            else:
+                values.append(str(value))
+        return '\t'.join(values) + '\n'
+
     def _add_row_to_table(self, table_name:str, columns: Dict[str, str], SRID:int):
         """
         Insert a row into a PostgreSQL table, converting geometries in WKT format to the correct spatial representation.
 
-        This method constructs an SQL `INSERT` query to add a row to the specified table. It processes each column 
-        in the input dictionary `columns`, checking if the value represents a WKT geometry. If a column contains 
-        WKT geometry, it is converted using `ST_GeomFromText`. Non-geometry string values are escaped and single-quoted.
-
         Parameters:
             table_name (str): The name of the table to insert the row into.
             columns (Dict[str, str]): A dictionary of column names and their corresponding values to be inserted.
@@ -500,17 +622,17 @@ class GeoDBManager:
             psycopg2.Error: Raised if there is any issue with the PostgreSQL query execution, such as connection issues 
                 or malformed queries.
         """
-        for key, value in columns.items():
-            if isinstance(value, str):
-                if self.is_wkt(value):
-                    columns[key] = f"ST_GeomFromText('{value}', {SRID})"
-                else:
-                    value = value.replace("'", "\'\'") # quotes in the string need to be double so it doesn't interrupt the query
-                    columns[key] = f"'{value}'" # string values need to be single quoted
+        self._execute_insert(table_name, self._format_row(columns, SRID))
 
-        str_columns = ', '.join(map(str, columns.values()))
-        str_columns = str_columns.replace("None", "null")
-        query = f'INSERT INTO {table_name} VALUES({str_columns})'
+    def _execute_insert(self, table_name:str, row:str) -> None:
+        """
+        Execute and commit the `INSERT` statement of a single row already formatted by `_format_row`.
+
+        Parameters:
+            table_name (str): The name of the table to insert the row into.
+            row (str): The SQL values of the row, enclosed in parentheses.
+        """
+        query = f'INSERT INTO {table_name} VALUES{row}'
         self.log(f'Executing query: {query}', logging.DEBUG)
         try:
             self._cursor.execute(query)
@@ -520,6 +642,34 @@ class GeoDBManager:
         except Exception as e:
             self.log(f'Error during insertion of row into table {table_name}.', logging.ERROR)
             self.log(e, logging.ERROR)
+            self._rollback()  # Leave the transaction usable for the next rows
+
+    def _format_row(self, columns: Dict[str, str], SRID:int) -> str:
+        """
+        Format the values of a row as the SQL values of an `INSERT` statement.
+
+        This method processes each column in the input dictionary `columns`, checking if the value represents 
+        a WKT geometry. If a column contains WKT geometry, it is converted using `ST_GeomFromText`. 
+        Non-geometry string values are escaped and single-quoted.
+
+        Parameters:
+            columns (Dict[str, str]): A dictionary of column names and their corresponding values to be inserted.
+            SRID (int): The spatial reference ID (SRID) for the geometry.
+
+        Returns:
+            str: The values of the row enclosed in parentheses, e.g. `('name', null, ST_GeomFromText('POINT (1 2)', 4258))`.
+        """
+        for key, value in columns.items():
+            if isinstance(value, str):
+                if self.is_wkt(value):
+                    columns[key] = f"ST_GeomFromText('{value}', {SRID})"
+                else:
+                    value = value.replace("'", "\'\'") # quotes in the string need to be double so it doesn't interrupt the query
+                    columns[key] = f"'{value}'" # string values need to be single quoted
+
+        str_columns = ', '.join(map(str, columns.values()))
+        str_columns = str_columns.replace("None", "null")
+        return f'({str_columns})'
             
     @staticmethod
     def is_wkt(column_value: str) -> bool:
@@ -38,7 +38,7 @@ import io
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Dict, Generator
+from typing import Optional, Dict, Generator, Mapping
 import sys
 
 from bs4 import BeautifulSoup
@@ -50,7 +50,7 @@ from zipfile import ZipFile
 from src.modules.capabilities import WFSCapabilities, WCSCapabilities, OpenAPIDoc
 import src.utils.utils as utils
 
-from src.utils.constants import WFS_PARAMETERS, WCS_PARAMETERS
+from src.utils.constants import WFS_PARAMETERS, WCS_PARAMETERS, WFS_REQUIRED_PARAMETERS, WCS_REQUIRED_PARAMETERS, ParamSpec, missing_parameters
 
 
 os.environ['GDAL_DATA'] = gdal.GetConfigOption('GDAL_DATA') or Path(sys.executable).parent.as_posix() + r'\Library\share\gdal'
@@ -210,7 +210,7 @@ class WFSService(InspireDownloadService):
     ## Methods
         get_feature_from_stored_query(self, STORED_QUERY:str, **args) -> Generator[ogr.Feature, None, None]:
             Fetches features from the WFS service using a stored query.
-        get_feature_parameters(self) -> Dict[str, bool]:
+        get_feature_parameters(self) -> Mapping[str, ParamSpec]:
             Retrieves the feature parameters supported by the WFS service for the given version.
         get_feature(self, SQL_PREDICATE:Optional[str] = None, **args) -> Generator[ogr.Feature, None, None]:
             Fetches features from the WFS service based on specified parameters.
@@ -267,12 +267,12 @@ class WFSService(InspireDownloadService):
         else:
             print('The stored query {stored_query} does not exist.')
 
-    def get_feature_parameters(self) -> Dict[str, bool]:
+    def get_feature_parameters(self) -> Mapping[str, ParamSpec]:
         """
         Retrieves the feature parameters supported by the WFS service for the given version.
 
         Returns:
-            (Dict[str, bool]): A dictionary of feature parameters and their availability (True/False).
+            (Mapping[str, ParamSpec]): The description, type and requirement of each feature parameter.
         """
         return WFS_PARAMETERS.get(self.version)
 
@@ -292,7 +292,7 @@ class WFSService(InspireDownloadService):
         """
         # https://gdal.org/api/python/vector_api.html
         parameters = self.get_feature_parameters()
-        missing = [key for (key, value) in parameters.items() if value.get('required') and not args.get(key) and not key in ['service', 'request', 'version']]
+        missing = missing_parameters(WFS_REQUIRED_PARAMETERS.get(self.version, ()), args)
         if len(missing) == 0:
             not_valid_params = []
             url = self.source + f'?service=WFS&version={self.version}&request=GetFeature'
@@ -338,7 +338,7 @@ class WCSService(InspireDownloadService):
         capabilities (Capabilities): An instance representing the capabilities of the WCS service.
         
     ## Methods
-        get_coverage_parameters(self) -> Dict[str, bool]:
+        get_coverage_parameters(self) -> Mapping[str, ParamSpec]:
             Retrieves the coverage parameters supported by the WCS service for the given version.
         get_coverage(self, filename: Optional[str] = None, **args) -> None:
             Fetches coverages from the WCS service based on specified parameters and saves the response to a file.
@@ -363,12 +363,12 @@ class WCSService(InspireDownloadService):
         self.__capabilities = WCSCapabilities(self.service, self.version, self.source)
         self.log(f'WCS {name} service READING STARTED')
 
-    def get_coverage_parameters(self) -> Dict[str, bool]:
+    def get_coverage_parameters(self) -> Mapping[str, ParamSpec]:
         """
         Retrieves the coverage parameters supported by the WCS service for the given version.
 
         Returns:
-            (Dict[str, bool]): A dictionary of coverage parameters and their availability (True/False).
+            (Mapping[str, ParamSpec]): The description, type and requirement of each coverage parameter.
         """
         return WCS_PARAMETERS.get(self.version)
 
@@ -401,7 +401,7 @@ class WCSService(InspireDownloadService):
         
         
         # Check for missing required parameters
-        missing = [key for (key, value) in parameters.items() if value.get('required') and not args.get(key) and not key in ['service', 'request', 'version']]
+        missing = missing_parameters(WCS_REQUIRED_PARAMETERS.get(self.version, ()), args)
         # If there are missing required parameters (other than the conditional sets), raise an error
         if len(missing) > 0:
             self.log(f'The following mandatory parameters are missing: {missing}', logging.CRITICAL)
@@ -522,10 +522,13 @@ class AtomService(InspireDownloadService):
         feeds = html.findAll('feed')
         for feed in feeds:
             [links.extend(entry.findAll('link', href=True)) for entry in feed.findAll('entry')]
+        # Request the nested feeds concurrently, and take their responses in the order of the links
+        feed_links = [link.attrs.get('href').lower() for link in links if link.attrs.get('type') == "application/atom+xml"]
+        nested_feeds = utils.request_many(href for href in feed_links if href.endswith('.xml'))
         for link in links:
             href = link.attrs.get('href').lower()
             if (link.attrs.get('type') == "application/atom+xml" and href.endswith('.xml')):
-                new_xml = utils.request(href)
+                new_xml = next(nested_feeds)
                 if new_xml and new_xml != xml:
                     yield from self.recurse_links(parent_link=href, xml=new_xml)
             elif link != metadata and link not in metadata and link.name == 'link':
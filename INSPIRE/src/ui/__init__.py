@@ -1,34 +1,99 @@
+from collections.abc import Mapping
+import copy
 from datetime import datetime
+from functools import reduce
 import importlib.util
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import psycopg2
-
-import pandas as pd
-from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from dotenv import dotenv_values
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard json module is used if it is not installed
+    orjson = None
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
     QLineEdit, QPushButton, QCheckBox, QFormLayout, QLabel, QInputDialog, QDialog, 
     QDialogButtonBox, QTabWidget, QComboBox, QDateEdit, QMenuBar, QAction, 
     QSpinBox, QMessageBox, QTableWidget, QTableWidgetItem, QTreeView, QFileSystemModel
 )
-from PyQt5.QtCore import QDate, QThread, pyqtSignal
-from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, QDate, QThread, QTimer, QMutex, QMutexLocker, QWaitCondition, QUrl, pyqtSignal
+from PyQt5.QtGui import QIcon, QDesktopServices
+
+from src.utils.utils import day_ranges, month_ranges, prefetch
+
+SAVE_DELAY_MS = 100 # Edits made within this interval are written to disk in a single save
+FEATURE_BATCH_SIZE = 500 # Number of features inserted into the database with a single statement
+PROGRESS_INTERVAL = 100 # Number of inserted features between two progress updates
+REPORTS_DIR = Path('reports') # Directory where the reports of each region are saved
+WORKER_LOGGERS = ('src.modules.inspire', 'src.modules.capabilities', 'src.modules.database', 'src.modules.reports') # Loggers of the processing modules
+DATE_RANGE_PREDICATE = "beginLifespanVersion >= '{}' and beginLifespanVersion < '{}'".format # Filter of the WFS requests
+
+def read_json(path: str) -> Any:
+    """
+    Read a JSON file with a single read and parse it from memory.
+
+    Parameters:
+        path (str): The path of the JSON file.
+
+    Returns:
+        Any: The parsed JSON data.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file is not valid JSON (orjson errors are a subclass of it).
+    """
+    content = Path(path).read_bytes()
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def dump_json(data: Any) -> bytes:
+    """
+    Serialize JSON data to pretty-printed UTF-8 bytes, with orjson if it is installed.
+
+    Both serializers produce the same layout, with an indentation of two spaces.
+
+    Parameters:
+        data (Any): The JSON data to serialize.
+
+    Returns:
+        bytes: The serialized data.
+    """
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('UTF-8')
+
+def replace_file(path: str, content: bytes) -> None:
+    """
+    Write the content to a temporary file and move it over the file at `path`.
+
+    `os.replace` is atomic on both POSIX and Windows, so the file is never left half-written.
+
+    Parameters:
+        path (str): The path of the file to write.
+        content (bytes): The new content of the file.
+    """
+    tmp_file = Path(f'{path}.tmp')
+    tmp_file.write_bytes(content)
+    os.replace(tmp_file, path)
+
+def freeze_schema(schema: Dict[str, Any]) -> Mapping:
+    """
+    Build a read-only view of a schema, including its nested dictionaries.
 
-from src.modules.inspire import WFSService, AtomService
-from src.modules.database import GeoDBManager
-from src.modules.loggers import Logger
-from src.modules.reports import Document
-from src.utils.utils import day_ranges, month_ranges
+    Parameters:
+        schema (Dict[str, Any]): The schema to freeze.
 
-APP = QApplication(sys.argv)
+    Returns:
+        Mapping: A `MappingProxyType` that raises a TypeError if the schema is modified.
+    """
+    return MappingProxyType({key: freeze_schema(value) if isinstance(value, dict) else value for key, value in schema.items()})
 
-# Define the schema globally
-service_schema: Dict[str, Any] = {
+# Define the schema globally. The schemas are shared by every editor, so they are read-only
+service_schema: Mapping = freeze_schema({
     "service": {
         "url": "",
         "type": "WFS",
@@ -42,9 +107,9 @@ service_schema: Dict[str, Any] = {
         "schema": "",
         "table": ""
     }
-}
+})
 
-mapping_schema: Dict[str, Any] = {
+mapping_schema: Mapping = freeze_schema({
     'beginlifespanversion' : 'beginlifespanversion',
     'localid' : 'localid',
     'namespace' : 'namespace',
@@ -55,7 +120,48 @@ mapping_schema: Dict[str, Any] = {
     'text' : 'text',
     'script' : 'script',
     'type' : 'type'
-}
+})
+
+def flatten_schema(schema: Mapping, parent_keys: Optional[List[str]] = None) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Flatten a schema into the list of form fields needed to fill it in.
+
+    Parameters:
+        schema (Mapping): The schema to flatten, which can contain nested dictionaries.
+        parent_keys (Optional[List[str]]): The keys of the parent dictionaries. Defaults to None.
+
+    Returns:
+        List[Tuple[str, Optional[str], Optional[str]]]: A (label, key path, default value) tuple for each field.
+            Nested dictionaries produce a section label whose key path and default value are None.
+    """
+    parent_keys = parent_keys or []
+    fields = []
+    for key, value in schema.items():
+        full_key_path = parent_keys + [key]
+        if isinstance(value, Mapping):
+            fields.append((f"{key}:", None, None))
+            fields.extend(flatten_schema(value, full_key_path))
+        else:
+            fields.append((key, ".".join(full_key_path), str(value)))
+    return fields
+
+def schema_template(schema: Mapping) -> Dict[str, Any]:
+    """
+    Build an empty, editable copy of a schema, keeping its nested dictionaries and the order of its keys.
+
+    Parameters:
+        schema (Mapping): The schema to copy.
+
+    Returns:
+        Dict[str, Any]: The same structure as the schema with every value set to None.
+    """
+    return {key: schema_template(value) if isinstance(value, Mapping) else None for key, value in schema.items()}
+
+# The schemas are constant, so their form fields and templates are computed only once
+SERVICE_SCHEMA_FIELDS = tuple(flatten_schema(service_schema))
+MAPPING_SCHEMA_FIELDS = tuple(flatten_schema(mapping_schema))
+SERVICE_SCHEMA_TEMPLATE = schema_template(service_schema)
+MAPPING_SCHEMA_TEMPLATE = schema_template(mapping_schema)
 
 class KeyValueDialog(QDialog):
     def __init__(self, parent=None):
@@ -89,6 +195,108 @@ class KeyValueDialog(QDialog):
         """Returns the key and value entered by the user."""
         return self.key_input.text(), self.value_input.text()
 
+class JsonTreeItem(QTreeWidgetItem):
+    """
+    A tree item whose children are only created when it is expanded for the first time.
+
+    Attributes:
+        pending (Any): The JSON content (dict or list) whose items have not been added to the tree yet,
+                       or None once the children have been created.
+    """
+    def __init__(self, labels: List[str], pending: Any = None) -> None:
+        super().__init__(labels)
+        self.pending = pending or None
+        if self.pending is not None:
+            # Show the expand arrow even though the item has no children yet
+            self.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+
+class SaveWorker(QThread):
+    """
+    A thread that writes the serialized JSON content to disk, so the editor never waits on the file system.
+
+    The thread keeps running and waits for new content between writes. Only the latest content is kept:
+    if several saves are requested while a write is in progress, the intermediate ones are skipped and
+    only the last one is written.
+
+    Methods:
+        save(content: bytes) -> None:
+            Queues the content to be written and starts the thread if it is not running.
+        flush() -> None:
+            Blocks until the queued content has been written.
+        stop() -> None:
+            Writes the queued content and stops the thread.
+        run() -> None:
+            Writes the queued content every time it changes until the thread is stopped.
+    """
+
+    def __init__(self, json_file: str) -> None:
+        super().__init__()
+        self.json_file = json_file
+        self._content: Optional[bytes] = None
+        self._writing = False
+        self._stopping = False
+        self._mutex = QMutex()
+        self._queued = QWaitCondition()  # Woken when there is content to write or the thread must stop
+        self._idle = QWaitCondition()  # Woken when a write has finished
+
+    def save(self, content: bytes) -> None:
+        """
+        Queue the content to be written to the JSON file.
+
+        Parameters:
+            content (bytes): The serialized JSON data.
+        """
+        locker = QMutexLocker(self._mutex)
+        self._content = content
+        if not self.isRunning():
+            # The thread only ends after `stop`, which waits for it, so it is never restarted while finishing
+            self._stopping = False
+            self.start()
+        self._queued.wakeOne()
+        del locker
+
+    def flush(self) -> None:
+        """
+        Block until the queued content, if any, is on disk.
+        """
+        locker = QMutexLocker(self._mutex)
+        while self.isRunning() and (self._content is not None or self._writing):
+            self._idle.wait(self._mutex)
+        del locker
+
+    def stop(self) -> None:
+        """
+        Write the queued content, if any, and wait until the thread has finished.
+        """
+        locker = QMutexLocker(self._mutex)
+        self._stopping = True
+        self._queued.wakeOne()
+        del locker
+        self.wait()
+
+    def run(self) -> None:
+        """
+        Write the queued content to a temporary file and move it over the JSON file.
+        """
+        while True:
+            locker = QMutexLocker(self._mutex)
+            while self._content is None and not self._stopping:
+                self._queued.wait(self._mutex)
+            content, self._content = self._content, None
+            if content is None:
+                self._idle.wakeAll()
+                return
+            self._writing = True
+            del locker
+
+            try:
+                replace_file(self.json_file, content)
+            finally:
+                locker = QMutexLocker(self._mutex)
+                self._writing = False
+                self._idle.wakeAll()
+                del locker
+
 class JsonEditor(QWidget):
     """
     A widget for editing and managing JSON data in a tree-like structure, 
@@ -122,15 +330,17 @@ class JsonEditor(QWidget):
         load_json() -> Dict[str, Any]:
             Loads the specified JSON file and returns the parsed data.
         load_env() -> None:
-            Loads the environment variables from a `.env` file and sets the database connection fields.
+            Reads the variables of the `.env` file once and sets the database connection fields.
         populate_tree() -> None:
-            Populates the tree widget with the current JSON data and expands all nodes.
+            Populates the tree widget with the top-level JSON data and expands the regions.
         add_tree_items(data: Any, tree_item: QTreeWidgetItem) -> None:
-            Recursively adds items to the tree based on JSON data (handles dicts and lists).
+            Adds one level of items to the tree based on JSON data (handles dicts and lists).
+        fetch_tree_item(item: QTreeWidgetItem) -> None:
+            Creates the children of a tree item the first time it is expanded.
         open_add_item_form() -> None:
             Opens a form for adding a new region to the JSON file based on the schema.
-        generate_form_fields(schema: Dict[str, Any], layout: QFormLayout, parent_keys: List[str]) -> None:
-            Dynamically generates form input fields from the schema, supporting nested structures.
+        generate_form_fields(fields: Sequence[Tuple[str, Optional[str], Optional[str]]], layout: QFormLayout) -> None:
+            Generates the form input fields from the precomputed fields of a schema.
         clear_form_layout(layout: QFormLayout) -> None:
             Clears all input fields from the provided form layout.
         submit_new_data() -> None:
@@ -144,15 +354,25 @@ class JsonEditor(QWidget):
         item_selected(item: QTreeWidgetItem) -> None:
             Enables the delete button if a top-level item (region) is selected.
         save_json() -> None:
-            Saves the current state of the JSON data back to the original file.
+            Schedules the current state of the JSON data to be saved back to the original file.
+        write_json() -> None:
+            Serializes the JSON data and hands it over to the save thread.
+        flush_json() -> None:
+            Writes any scheduled save and waits until the file is on disk.
+        finish_saving() -> None:
+            Writes any scheduled save and stops the save thread.
         delete_item() -> None:
             Deletes the currently selected top-level region from the JSON data and tree.
-        get_item_key_path(item: QTreeWidgetItem) -> List[str]:
-            Returns the full key path of the selected tree item as a list of strings.
-        set_nested_value(data: Dict[str, Any], key_path: List[str], value: str) -> None:
+        get_item_key_path(item: QTreeWidgetItem) -> List[Union[str, int]]:
+            Returns the full key path of the selected tree item as a list of keys and list indices.
+        get_nested_value(data: Dict[str, Any], key_path: List[Union[str, int]]) -> Any:
+            Gets a value from a nested dictionary based on a list of keys representing the path.
+        set_nested_value(data: Dict[str, Any], key_path: List[Union[str, int]], value: str) -> None:
             Sets a value in a nested dictionary based on a list of keys representing the path.
-        remove_nested_value(data: Dict[str, Any], key_path: List[str]) -> None:
-            Recursively removes a key from a nested dictionary (JSON structure) based on the key path.
+        rename_key(data: Dict[str, Any], prev_key: str, key: str) -> None:
+            Renames a key of a dictionary in place, keeping its position.
+        remove_nested_value(data: Dict[str, Any], key_path: List[Union[str, int]]) -> None:
+            Removes a key from a nested dictionary (JSON structure) based on the key path.
         reload_json() -> None:
             Reloads the JSON data from the file and refreshes the tree widget.
         update_json_based_on_schema(new_schema: Dict[str, Any]) -> None:
@@ -175,6 +395,13 @@ class JsonEditor(QWidget):
         self.is_mapping_file = is_mapping_file
         self.data = self.load_json()
 
+        # The file is written by a separate thread, and rapid edits are coalesced into a single save
+        self.save_worker = SaveWorker(self.json_file)
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.write_json)
+
         # Main layout
         self.layout = QVBoxLayout()
 
@@ -200,6 +427,7 @@ class JsonEditor(QWidget):
             self.tree.setHeaderLabels(["Key", "Value"])
         self.tree.itemDoubleClicked.connect(self.edit_item)
         self.tree.itemClicked.connect(self.item_selected)  # Handle selection for delete
+        self.tree.itemExpanded.connect(self.fetch_tree_item)  # Create the children on demand
         self.json_layout.addWidget(self.tree)
 
         # Populate tree with initial data
@@ -276,8 +504,7 @@ class JsonEditor(QWidget):
             (Dict[str, Any]): The JSON data loaded from the file.
         """
         try:
-            with open(self.json_file, 'r', encoding='UTF-8') as file:
-                return json.load(file)
+            return read_json(self.json_file)
         except FileNotFoundError:
             print(f"Error: The file '{self.json_file}' was not found.")
             return {}
@@ -291,47 +518,105 @@ class JsonEditor(QWidget):
     def load_env(self) -> None:
         """
         Load the .env file and set the database connection fields if the file exists.
+
+        The values are read once into `self.env_values` without modifying `os.environ`.
         """
+        self.env_values = {}
         # Check if the .env file exists
         if os.path.exists('.env'):
-            load_dotenv()  # Load environment variables from .env file
+            self.env_values = dotenv_values('.env')  # Read the variables of the .env file
 
             # Set the form fields with values from .env
-            self.host_field.setText(os.getenv('HOST', ''))
-            self.port_field.setText(os.getenv('PORT', ''))
-            self.database_field.setText(os.getenv('DATABASE', ''))
-            self.username_field.setText(os.getenv('USERNAME', ''))
-            self.password_field.setText(os.getenv('PASSWORD', ''))
+            self.host_field.setText(self.env_values.get('HOST') or '')
+            self.port_field.setText(self.env_values.get('PORT') or '')
+            self.database_field.setText(self.env_values.get('DATABASE') or '')
+            self.username_field.setText(self.env_values.get('USERNAME') or '')
+            self.password_field.setText(self.env_values.get('PASSWORD') or '')
 
     def populate_tree(self) -> None:
         """
-        Populate the QTreeWidget with the JSON data and expand all nodes.
+        Populate the QTreeWidget with the JSON data and expand the top-level items.
+
+        Nested items are created lazily, when their parent is expanded for the first time, except
+        for a well-formed mapping file, whose two levels are always created at once.
+        Repaints, sorting and signals are disabled while the items are inserted.
         """
+        sorting_enabled = self.tree.isSortingEnabled()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.setSortingEnabled(False)
+        self.tree.blockSignals(True)
+
         self.tree.clear()
-        self.add_tree_items(self.data, self.tree.invisibleRootItem())
-        self.tree.expandAll()  # Expand all nodes to make the whole tree visible
+        root = self.tree.invisibleRootItem()
+        if self.is_mapping_file and isinstance(self.data, dict) and all(isinstance(columns, dict) for columns in self.data.values()):
+            # The mapping file maps each region to a flat dictionary of column names, so the items
+            # are built directly; any other content falls back to the generic path below
+            region_items = []
+            for region, columns in self.data.items():
+                region_item = QTreeWidgetItem([region, ""])
+                region_item.addChildren([QTreeWidgetItem([old_column, str(new_column)]) for old_column, new_column in columns.items()])
+                region_items.append(region_item)
+            root.addChildren(region_items)
+            self.tree.expandToDepth(0)
+        else:
+            self.add_tree_items(self.data, root)
+            for index in range(root.childCount()):
+                # Signals are blocked, so the children are created here instead of in the itemExpanded handler
+                self.fetch_tree_item(root.child(index))
+                root.child(index).setExpanded(True)
+
+        self.tree.blockSignals(False)
+        self.tree.setSortingEnabled(sorting_enabled)
+        self.tree.setUpdatesEnabled(True)
+        self.tree.viewport().update()
 
     def add_tree_items(self, data: Any, tree_item: QTreeWidgetItem) -> None:
         """
-        Recursively add items to the tree from JSON data.
+        Add the direct children of the JSON data to the tree.
+
+        Nested dictionaries and lists are not traversed: their items are kept as pending content
+        of the new tree item and only added when the item is expanded (see `fetch_tree_item`).
+        All the children are inserted with a single `addChildren` call.
 
         Args:
             data (Any): The JSON data to add, which can be a dict, list, or any other type.
             tree_item (QTreeWidgetItem): The parent tree item to which the new items will be added.
         """
         if isinstance(data, dict):
-            for key, value in data.items():
-                child = QTreeWidgetItem([key, ""])
-                tree_item.addChild(child)
-                self.add_tree_items(value, child)
+            tree_item.addChildren([self.create_tree_item(key, value) for key, value in data.items()])
         elif isinstance(data, list):
-            for index, value in enumerate(data):
-                child = QTreeWidgetItem([f"Index {index}", ""])
-                tree_item.addChild(child)
-                self.add_tree_items(value, child)
+            tree_item.addChildren([self.create_tree_item(f"Index {index}", value) for index, value in enumerate(data)])
         else:
             tree_item.setText(1, str(data))
 
+    @staticmethod
+    def create_tree_item(key: str, value: Any) -> JsonTreeItem:
+        """
+        Create the tree item for a (key, value) pair of the JSON data.
+
+        Args:
+            key (str): The text shown in the first column.
+            value (Any): The JSON value. Dicts and lists are kept as pending content of the item.
+
+        Returns:
+            JsonTreeItem: The new tree item.
+        """
+        if isinstance(value, (dict, list)):
+            return JsonTreeItem([key, ""], pending=value)
+        return JsonTreeItem([key, str(value)])
+
+    def fetch_tree_item(self, item: QTreeWidgetItem) -> None:
+        """
+        Create the children of a tree item if they have not been added yet.
+
+        Args:
+            item (QTreeWidgetItem): The expanded tree item.
+        """
+        pending = getattr(item, 'pending', None)
+        if pending is not None:
+            item.pending = None
+            self.add_tree_items(pending, item)
+
     def open_add_item_form(self) -> None:
         """
         Open the form for adding new regions based on the imported schema.
@@ -341,11 +626,11 @@ class JsonEditor(QWidget):
         self.region_name_field = QLineEdit()  # New region name
         self.schema_form.addRow("Region Name:", self.region_name_field)
 
-        # Use the global schema to create the form
+        # Use the fields of the global schema to create the form
         if self.is_mapping_file:
-            self.generate_form_fields(mapping_schema, self.schema_form, [])
+            self.generate_form_fields(MAPPING_SCHEMA_FIELDS, self.schema_form)
         else:
-            self.generate_form_fields(service_schema, self.schema_form, [])
+            self.generate_form_fields(SERVICE_SCHEMA_FIELDS, self.schema_form)
 
         # Check if buttons already exist
         if not hasattr(self, 'submit_button'):
@@ -362,18 +647,23 @@ class JsonEditor(QWidget):
         self.submit_button.show()  # Ensure buttons are shown
         self.cancel_button.show()  # Ensure buttons are shown    
     
-    def generate_form_fields(self, schema: Dict[str, Any], layout: QFormLayout, parent_keys: List[str]) -> None:
-        for key, value in schema.items():
-            full_key_path = parent_keys + [key]
-            if isinstance(value, dict):
-                # Recursively generate fields for nested dictionaries
-                layout.addRow(QLabel(f"{key}:"))
-                self.generate_form_fields(value, layout, full_key_path)
+    def generate_form_fields(self, fields: Sequence[Tuple[str, Optional[str], Optional[str]]], layout: QFormLayout) -> None:
+        """
+        Add the input fields of a schema to the form.
+
+        Args:
+            fields (Sequence[Tuple[str, Optional[str], Optional[str]]]): The (label, key path, default value) tuples returned by `flatten_schema`.
+            layout (QFormLayout): The layout to which the fields are added.
+        """
+        for label, key_path, default_value in fields:
+            if key_path is None:
+                # Section label for nested dictionaries
+                layout.addRow(QLabel(label))
             else:
                 # Create input fields for primitive types (strings, etc.)
-                input_field = QLineEdit(str(value))  # Pre-fill with default value
-                input_field.setObjectName(".".join(full_key_path))  # Store the full key path as object name
-                layout.addRow(key, input_field)
+                input_field = QLineEdit(default_value)  # Pre-fill with default value
+                input_field.setObjectName(key_path)  # Store the full key path as object name
+                layout.addRow(label, input_field)
     
     def clear_form_layout(self, layout: QFormLayout) -> None:
         """
@@ -391,20 +681,20 @@ class JsonEditor(QWidget):
         """
         Submit the new data entered in the form and update the JSON data.
 
-        The new region is added to the JSON structure and the tree is refreshed.
+        The new region is added to the JSON structure and its item is added to the tree.
         """
         region_name = self.region_name_field.text()
         if not region_name:
             # Handle the case where the region name is not provided
             return
 
-        new_region_data = {}
+        # The nested dictionaries already exist in the template, so each value is a single assignment
+        new_region_data = copy.deepcopy(MAPPING_SCHEMA_TEMPLATE if self.is_mapping_file else SERVICE_SCHEMA_TEMPLATE)
         for i in range(self.schema_form.count()):
             item = self.schema_form.itemAt(i)
             if isinstance(item.widget(), QLineEdit) and item.widget() != self.region_name_field:
-                key_path = item.widget().objectName().split(".")
-                value = item.widget().text()
-                self.set_nested_value(new_region_data, key_path, value=value)
+                *parent_keys, key = item.widget().objectName().split(".")
+                reduce(dict.__getitem__, parent_keys, new_region_data)[key] = item.widget().text()
 
         # Add new region to the main JSON
         self.data[region_name] = new_region_data
@@ -412,8 +702,20 @@ class JsonEditor(QWidget):
         # Save updated data
         self.save_json()
 
-        # Update the tree display
-        self.populate_tree()
+        # Update the tree display, replacing only the item of the new region
+        self.tree.setUpdatesEnabled(False)
+        root = self.tree.invisibleRootItem()
+        new_item = self.create_tree_item(region_name, new_region_data)
+        existing_items = self.tree.findItems(region_name, Qt.MatchExactly, 0)
+        if existing_items:
+            index = root.indexOfChild(existing_items[0])
+            root.removeChild(existing_items[0])
+            root.insertChild(index, new_item)
+        else:
+            root.addChild(new_item)
+        self.fetch_tree_item(new_item)
+        new_item.setExpanded(True)
+        self.tree.setUpdatesEnabled(True)
 
         # Clear the form
         self.clear_form_layout(self.schema_form)
@@ -438,21 +740,29 @@ class JsonEditor(QWidget):
         """Add a new key to the selected item."""
         current_item = self.tree.currentItem()
         if current_item:
+            # Make sure the existing children are in the tree before adding a new one
+            self.fetch_tree_item(current_item)
             dialog = KeyValueDialog(self)
             if dialog.exec_() == QDialog.Accepted:
                 # Get the entered key and value from the dialog
                 new_key, new_value = dialog.get_data()
                 # Ensure key is not empty
                 if new_key:
+                    key_path = self.get_item_key_path(current_item)
+                    if isinstance(self.get_nested_value(self.data, key_path), list):
+                        QMessageBox.warning(self, "Invalid Selection", "Keys cannot be added to a list.")
+                        return
+                    # A value that receives a child becomes a nested dictionary
+                    if not isinstance(self.get_nested_value(self.data, key_path), dict):
+                        self.set_nested_value(self.data, key_path, value={})
+                        current_item.setText(1, "")
                     # Add the new key-value pair to the tree
                     current_item.addChild(QTreeWidgetItem([new_key, str(new_value)]))
-                    # Update the JSON data
-                    key_path = self.get_item_key_path(current_item)
-                    new_data = {new_key: new_value}
-                    self.set_nested_value(self.data, key_path, value=new_data)
+                    # Update only the modified path of the JSON data
+                    self.set_nested_value(self.data, key_path + [new_key], value=new_value)
 
                     # Save the updated JSON
-                    self.save_changes()
+                    self.save_json()
                 else:
                     QMessageBox.warning(self, "Invalid Input", "Key cannot be empty.")
                     
@@ -466,27 +776,44 @@ class JsonEditor(QWidget):
 
             if reply == QMessageBox.Yes:
                 if current_item and current_item.parent():
-                    index = current_item.parent().indexOfChild(current_item)
-                    current_item.parent().removeChild(current_item)
+                    # Get the path before the item is detached from the tree
+                    key_path = self.get_item_key_path(current_item)
+                    parent = current_item.parent()
+                    parent.removeChild(current_item)
+                    # Update only the modified path of the JSON data
+                    self.remove_nested_value(self.data, key_path)
+                    if isinstance(key_path[-1], int):
+                        # The following items of the list have moved back one position
+                        for index in range(key_path[-1], parent.childCount()):
+                            parent.child(index).setText(0, f"Index {index}")
                     # Save the updated JSON
-                    self.save_changes()
+                    self.save_json()
                 else:
                     QMessageBox.warning(self, "Invalid Selection", "Please select a parameter to remove.")
 
     def save_changes(self) -> None:
-        """Save changes made in the tree back to the schema."""
+        """
+        Rebuild the JSON data from the whole tree and save it.
+
+        Edits update `self.data` in place, so this is only needed to resynchronize the data with the tree.
+        """
         self.data = {}
         self.update_data_from_tree(self.tree.invisibleRootItem(), self.data)
         self.save_json()
             
     def update_data_from_tree(self, item: QTreeWidgetItem, schema: Dict[str, Any]) -> None:
         """Recursively update the schema based on the tree contents."""
+        # Each text()/child()/childCount() call crosses into Qt, so every value is read only once
         for i in range(item.childCount()):
             child = item.child(i)
             key = child.text(0)
-            if child.childCount() > 0:
-                schema[key] = {}
-                self.update_data_from_tree(child, schema[key])
+            pending = getattr(child, 'pending', None)
+            if pending is not None:
+                schema[key] = pending  # Children not created yet, keep the JSON content
+            elif child.childCount() > 0:
+                sub_schema = {}
+                schema[key] = sub_schema
+                self.update_data_from_tree(child, sub_schema)
             else:
                 schema[key] = child.text(1)  # Update value
 
@@ -509,12 +836,43 @@ class JsonEditor(QWidget):
     
     def save_json(self) -> None:
         """
-        Save the current JSON data back to the file.
+        Schedule the current JSON data to be saved back to the file.
 
-        This method writes the modified JSON data to the specified file in a pretty-printed format.
+        The save is delayed by `SAVE_DELAY_MS`, so several edits made in a row are written only once.
         """
-        with open(self.json_file, 'w', encoding='UTF-8') as file:
-            json.dump(self.data, file, indent=4, ensure_ascii=False)
+        self.save_timer.start()  # Restarting the timer postpones the pending save
+
+    def write_json(self) -> None:
+        """
+        Serialize the current JSON data and hand it over to the save thread.
+
+        The data is serialized here, on the GUI thread, so the save thread never reads `self.data`
+        while it is being edited. The thread writes the content to a temporary file first and then
+        moves it over the original one, so the file is never left half-written.
+        """
+        self.save_timer.stop()
+        self.save_worker.save(dump_json(self.data))
+
+    def flush_json(self) -> None:
+        """
+        Write the scheduled save, if any, and wait until the JSON file is on disk.
+        """
+        if self.save_timer.isActive():
+            self.write_json()
+        self.save_worker.flush()
+
+    def finish_saving(self) -> None:
+        """
+        Write the scheduled save, if any, and stop the save thread.
+        """
+        if self.save_timer.isActive():
+            self.write_json()
+        self.save_worker.stop()
+
+    def closeEvent(self, event) -> None:
+        """Make sure the last edits are saved before the editor is closed."""
+        self.finish_saving()
+        super().closeEvent(event)
 
     def edit_item(self, item: QTreeWidgetItem, column:int) -> None:
         """
@@ -526,6 +884,8 @@ class JsonEditor(QWidget):
         key = item.text(0)
         value = item.text(1)
         if self.is_mapping_file and column == 0:
+            if isinstance(self.get_item_key_path(item)[-1], int):
+                return  # The items of a list are identified by their index, which cannot be renamed
             new_key, ok = QInputDialog.getText(self, "Edit key", f"Edit key '{key}':", QLineEdit.Normal, key)
             if ok and new_key:
                 # Update the tree
@@ -552,7 +912,7 @@ class JsonEditor(QWidget):
         Delete the selected region (top-level item) from the tree and JSON data.
 
         If the selected item is a top-level item, it will be removed from the data structure
-        and the tree view will be updated accordingly.
+        and from the tree view.
         """
         selected_item = self.tree.currentItem()
         if selected_item and selected_item.parent() is None:
@@ -565,73 +925,106 @@ class JsonEditor(QWidget):
                 # Save the updated JSON data
                 self.save_json()
 
-                # Refresh the tree to reflect the changes
-                self.populate_tree()
+                # Remove only the deleted region from the tree
+                self.tree.invisibleRootItem().removeChild(selected_item)
 
                 # Disable the delete button after deletion
                 self.delete_button.setEnabled(False)
                 
-    def get_item_key_path(self, item: QTreeWidgetItem) -> List[str]:
+    def get_item_key_path(self, item: QTreeWidgetItem) -> List[Union[str, int]]:
         """
         Get the full key path of a tree item.
 
+        The items of a JSON list are labelled "Index N" in the tree, so their key is the index N.
+
         Parameters:
             item (QTreeWidgetItem): The tree item whose key path is to be determined.
 
         Returns:
-            List[str]: A list of keys representing the path to the item in the JSON data.
+            List[Union[str, int]]: A list of keys (and list indices) representing the path to the item in the JSON data.
         """
-        key_path = []
+        labels = []
         while item:
-            key_path.insert(0, item.text(0))
+            labels.append(item.text(0))
             item = item.parent()
+        labels.reverse()  # The path has been built from the item up to the root
+
+        key_path = []
+        node = self.data
+        for label in labels:
+            key = label
+            if isinstance(node, list) and label.startswith("Index ") and label[6:].isdigit():
+                key = int(label[6:])
+            key_path.append(key)
+            node = self.get_nested_value(node, [key])
         return key_path
 
-    def set_nested_value(self, data: Dict[str, Any], key_path: str, prev_key: Optional[str]=None, value: Optional[str]=None) -> None:
+    def get_nested_value(self, data: Dict[str, Any], key_path: List[str]) -> Any:
         """
-        Set a value in a nested dictionary based on a dot-separated key path.
+        Get a value from a nested dictionary based on a list of keys.
+
+        Parameters:
+            data (Dict[str, Any]): The dictionary to read.
+            key_path (List[Union[str, int]]): A list of keys (and list indices) representing the path to the value.
+
+        Returns:
+            Any: The value found at the given path, or None if the path does not exist.
+        """
+        for key in key_path:
+            if isinstance(data, dict) and key in data:
+                data = data[key]
+            elif isinstance(data, list) and isinstance(key, int) and 0 <= key < len(data):
+                data = data[key]
+            else:
+                return None
+        return data
+
+    def set_nested_value(self, data: Dict[str, Any], key_path: List[Union[str, int]], prev_key: Optional[str]=None, value: Optional[str]=None) -> None:
+        """
+        Set a value in a nested dictionary based on a list of keys.
+
+        Missing intermediate keys are created as empty dictionaries, and the integer keys index lists.
+        If `prev_key` is given, the last key of the path is the new name of `prev_key`, which is renamed
+        instead of setting a value (the items of a list cannot be renamed).
 
         Parameters:
             data (Dict[str, Any]): The dictionary to modify.
-            key_path (str): The dot-separated string representing the path to the value.
+            key_path (List[Union[str, int]]): A list of keys (and list indices) representing the path to the value.
+            prev_key (Optional[str]): The previous name of the last key, when the key is renamed.
             value (str): The value to set.
         """
-        key = key_path[0]
-        if len(key_path) > 1:
-            if key not in data:
-                if prev_key is None:
-                    data[key] = {}
-                else:
-                    new_data = {}
-                    for old_key, value in data.items():
-                        if old_key == prev_key:
-                            new_data[key] = data[old_key]  # Insert the new key with the old value
-                        else:
-                            new_data[old_key] = value  # Keep other keys unchanged
-                    if new_data:
-                        data.clear()
-                        for k, v in new_data.items():
-                            data[k] = v
-            self.set_nested_value(data[key], key_path[1:], prev_key=prev_key, value=value)
-        else:
-            if prev_key is None:
-                data[key] = value
-            else:
-                new_data = {}
-                for old_key, value in data.items():
-                    if old_key == prev_key:
-                        new_data[key] = data[old_key]  # Insert the new key with the old value
-                    else:
-                        new_data[old_key] = value  # Keep other keys unchanged
-                if new_data:
-                    data.clear()
-                    for k, v in new_data.items():
-                        data[k] = v
-            
+        node = data
+        for key in key_path[:-1]:
+            node = node[key] if isinstance(node, list) else node.setdefault(key, {})
+        if prev_key is None:
+            node[key_path[-1]] = value
+        elif isinstance(node, dict):
+            self.rename_key(node, prev_key, key_path[-1])
+
+    @staticmethod
+    def rename_key(data: Dict[str, Any], prev_key: str, key: str) -> None:
+        """
+        Rename a key of a dictionary in place, keeping its position.
 
-    def remove_nested_value(self, data: Dict[str, Any], key_path: List[str]) -> None:
+        Only the keys placed after the renamed one are moved, instead of rebuilding the whole dictionary.
+
+        Parameters:
+            data (Dict[str, Any]): The dictionary to modify.
+            prev_key (str): The current name of the key.
+            key (str): The new name of the key.
+        """
+        if prev_key not in data or prev_key == key:
+            return
+        keys = list(data)
+        following_keys = keys[keys.index(prev_key) + 1:]
+        data[key] = data.pop(prev_key)  # Insert the new key with the old value
+        for following_key in following_keys:
+            if following_key != key:
+                data[following_key] = data.pop(following_key)  # Move the following keys after the new one
+
+    def remove_nested_value(self, data: Dict[str, Any], key_path: List[Union[str, int]]) -> None:
         """
-        Recursively remove a key from the nested JSON structure.
+        Remove a key from the nested JSON structure.
 
         This method traverses the given nested dictionary (JSON structure) based on
         the provided key path and removes the specified key. If the key path consists
@@ -640,15 +1033,15 @@ class JsonEditor(QWidget):
 
         Parameters:
             data (Dict[str, Any]): The nested dictionary from which the key should be removed.
-            key_path (List[str]): A list of keys representing the path to the key to be removed.
+            key_path (List[Union[str, int]]): A list of keys representing the path to the key to be removed.
                                 The first element is the top-level key, and each subsequent
-                                element represents a deeper level in the nested structure.
+                                element represents a deeper level in the nested structure
+                                (an integer for the items of a list).
         """
-        key = key_path[0]
-        if len(key_path) > 1:
-            self.remove_nested_value(data[key], key_path[1:])
-        else:
-            del data[key]
+        node = data
+        for key in key_path[:-1]:
+            node = node[key]
+        del node[key_path[-1]]
             
     def reload_json(self) -> None:
         """Reload the JSON data and refresh the QTreeWidget."""
@@ -681,10 +1074,10 @@ class JsonEditor(QWidget):
             json.JSONDecodeError: Raised if there's an error in reading `config.json`.
             Any other exceptions raised while saving the file are caught and printed.
         """
-        # Load the existing config.json
+        # Load the existing config.json, once the pending edits have been written
+        self.flush_json()
         try:
-            with open(self.json_file, 'r', encoding='UTF-8') as config_file:
-                config = json.load(config_file)
+            config = read_json(self.json_file)
         except FileNotFoundError:
             print("config.json not found.")
             return
@@ -692,25 +1085,19 @@ class JsonEditor(QWidget):
             print(f"Error reading config.json: {e}")
             return
 
+        new_params = new_schema["service"]["parameters"]
+
         # Update each region's service and database with new schema parameters
         for region, data in config.items():
             # Update service parameters
             service = data.get("service", {})
             service_params = service.get("parameters", {})
 
-            # Add or update parameters in the service
-            for param, value in new_schema["service"]["parameters"].items():
-                if param not in service_params:
-                    service_params[param] = value  # Add new parameters
-                else:
-                    service_params[param] = value  # Update existing parameters
+            # Add new parameters and update existing ones in a single call
+            service_params.update(new_params)
 
-            # Remove parameters not present in the new schema
-            for param in list(service_params.keys()):
-                if param not in new_schema["service"]["parameters"]:
-                    del service_params[param]
-
-            service["parameters"] = service_params  # Update the service parameters
+            # Keep only the parameters present in the new schema, in a single pass
+            service["parameters"] = {param: value for param, value in service_params.items() if param in new_params}
             data["service"] = service  # Update the config for this region
 
             # Optionally, you can also update database parameters if needed
@@ -718,8 +1105,7 @@ class JsonEditor(QWidget):
 
         # Save the updated config back to config.json
         try:
-            with open(self.json_file, 'w', encoding='UTF-8') as config_file:
-                json.dump(config, config_file, ensure_ascii=False, indent=4)
+            replace_file(self.json_file, dump_json(config))
             print("config.json updated successfully.")
         except Exception as e:
             print(f"Error saving config.json: {e}")
@@ -731,14 +1117,24 @@ class JsonEditor(QWidget):
         Save the DB connection info to a .env file.
 
         This method writes the current database connection information into a .env file
-        which can be used to load environment variables later.
+        which can be used to load environment variables later. The file is only rewritten
+        if any of the values has changed since it was last loaded or saved.
         """
-        with open('.env', 'w', encoding='UTF-8') as env_file:
-            env_file.write(f"HOST={self.host_field.text()}\n")
-            env_file.write(f"PORT={self.port_field.text()}\n")
-            env_file.write(f"DATABASE={self.database_field.text()}\n")
-            env_file.write(f"USERNAME={self.username_field.text()}\n")
-            env_file.write(f"PASSWORD={self.password_field.text()}\n")
+        env_values = {
+            'HOST': self.host_field.text(),
+            'PORT': self.port_field.text(),
+            'DATABASE': self.database_field.text(),
+            'USERNAME': self.username_field.text(),
+            'PASSWORD': self.password_field.text(),
+        }
+        if all(self.env_values.get(key) == value for key, value in env_values.items()):
+            return
+
+        content = ''.join(f"{key}={value}\n" for key, value in env_values.items())
+        with open('.env.tmp', 'w', encoding='UTF-8') as env_file:
+            env_file.write(content)
+        os.replace('.env.tmp', '.env')
+        self.env_values = env_values
 
 class ConfigPathsDialog(QDialog):
     """
@@ -759,8 +1155,7 @@ class ConfigPathsDialog(QDialog):
         open_file_from_path(row, column):
             Opens the file corresponding to the path in the selected table row if the 
             path column is double-clicked. The file is opened with the system's default 
-            application, depending on the operating system (e.g., xdg-open for Linux, 
-            os.startfile for Windows).
+            application through `QDesktopServices`.
     """
     def __init__(self, services_config, mapping_info, database_config):
         super().__init__()
@@ -770,19 +1165,26 @@ class ConfigPathsDialog(QDialog):
 
         layout = QVBoxLayout()
 
+        paths = [
+            ("Services Config", services_config),
+            ("Table Mapping Info", mapping_info),
+            ("Database Config", database_config),
+        ]
+
         # Create a QTableWidget
         self.paths_table = QTableWidget()
-        self.paths_table.setRowCount(3)  # 3 rows for each configuration path
+        self.paths_table.setRowCount(len(paths))  # 1 row for each configuration path
         self.paths_table.setColumnCount(2)  # 2 columns: Description and Path
         self.paths_table.setHorizontalHeaderLabels(["Description", "Path"])
 
-        # Set configuration paths
-        self.paths_table.setItem(0, 0, QTableWidgetItem("Services Config"))
-        self.paths_table.setItem(0, 1, QTableWidgetItem(services_config))
-        self.paths_table.setItem(1, 0, QTableWidgetItem("Table Mapping Info"))
-        self.paths_table.setItem(1, 1, QTableWidgetItem(mapping_info))
-        self.paths_table.setItem(2, 0, QTableWidgetItem("Database Config"))
-        self.paths_table.setItem(2, 1, QTableWidgetItem(database_config))
+        # Set configuration paths, with a single repaint once all the items are set
+        self.paths_table.setUpdatesEnabled(False)
+        self.paths_table.blockSignals(True)
+        for row, (description, path) in enumerate(paths):
+            self.paths_table.setItem(row, 0, QTableWidgetItem(description))
+            self.paths_table.setItem(row, 1, QTableWidgetItem(path))
+        self.paths_table.blockSignals(False)
+        self.paths_table.setUpdatesEnabled(True)
 
         # Set read-only properties for table
         self.paths_table.setEditTriggers(QTableWidget.NoEditTriggers)  # Make it non-editable
@@ -800,165 +1202,235 @@ class ConfigPathsDialog(QDialog):
 
         This method is triggered when the user double-clicks a cell in the table. 
         If the double-click occurs in the 'Path' column (column 1), the method attempts 
-        to open the file at the specified path using the system's default application. 
-        The method checks the current operating system to determine the appropriate
-        method for opening the file.
+        to open the file at the specified path using the system's default application.
 
         Notes:
-        - On Linux and macOS, the file is opened with 'xdg-open'.
-        - On Windows, the file is opened with 'os.startfile'.
-        - If the file does not exist, a message is printed in the console.
+        - The file is opened with `QDesktopServices.openUrl`, which uses the native API of each
+          operating system, so no subprocess is launched.
+        - If the file does not exist or cannot be opened, a message is printed in the console.
         
         Parameters:
             row (int): The row index of the double-clicked cell.
             column (int): The column index of the double-clicked cell.
-        
-        Raises:
-            Exception: If the file cannot be opened due to a system or path-related error.
-        
         """
         if column == 1:  # Ensure the path column was clicked
             file_path = self.paths_table.item(row, 1).text()
             full_path = os.path.abspath(file_path)  # Convert to absolute path
 
             if os.path.exists(full_path):
-                # Try to open the file using the system's default application
-                try:
-                    if os.name == 'posix':  # For Linux and MacOS
-                        subprocess.run(['xdg-open', full_path], check=True)
-                    elif os.name == 'nt':  # For Windows
-                        os.startfile(full_path)
-                except Exception as e:
-                    print(f"Failed to open file: {e}")
+                # Open the file using the system's default application
+                if not QDesktopServices.openUrl(QUrl.fromLocalFile(full_path)):
+                    print(f"Failed to open file: {full_path}")
             else:
                 print("File does not exist:", full_path)
 
 class Worker(QThread):
     # Signal to communicate with the main thread
     update_progress = pyqtSignal(str)
+    # Loggers of the processing modules, configured on the first execution of each day and shared by the next ones
+    _loggers: Optional[Dict[str, Any]] = None
+    _loggers_date: Optional[str] = None  # Date of the log files of `_loggers`, as YYYYMMDD
     
     def __init__(self, config_file:str, date_ranges: List[datetime], execute_btn:QPushButton, mapping_file:Optional[str] = None) -> None:
         super().__init__()
         self.config_file = config_file
         self.mapping_file = mapping_file
-        self.date_ranges = date_ranges
+        self.date_ranges = tuple(date_ranges)
+        # The dates and filters of the requests are the same for every region, so they are built once
+        iso_ranges = ((begin.isoformat(), end.isoformat()) for begin, end in date_ranges)
+        self.date_filters = [(begin, end, DATE_RANGE_PREDICATE(begin, end)) for begin, end in iso_ranges]
         self.execute_btn = execute_btn
 
+    @classmethod
+    def loggers(cls) -> Dict[str, Any]:
+        """
+        Get the loggers of the processing modules, creating them the first time they are needed each day.
+
+        Configuring the loggers again on every execution would reopen their log files, so they are
+        created once and reused by every Worker. The log files are named after the date, so the loggers
+        are created again when the date changes, e.g. when the application runs the scheduled executions
+        for several days.
+
+        Returns:
+            Dict[str, Logger]: The loggers, by the name of their module.
+        """
+        today = datetime.today().strftime('%Y%m%d')
+        if cls._loggers is None or cls._loggers_date != today:
+            from src.modules.loggers import Logger
+            cls._loggers = {name: Logger(name, level='DEBUG', handlers=['console', 'file']) for name in WORKER_LOGGERS}
+            cls._loggers_date = today
+        return cls._loggers
+
+    def insert_features(self, database, schema: str, table: str, features, label: str) -> int:
+        """
+        Insert the features into the database in batches of `FEATURE_BATCH_SIZE`.
+
+        The features are downloaded in a separate thread (see `prefetch`), so the download of the next
+        features overlaps with the insertion of the previous ones. The progress is reported every
+        `PROGRESS_INTERVAL` features instead of once per feature, so the signals sent to the main
+        thread do not slow down the insertion.
+
+        Parameters:
+            database (GeoDBManager): The database connection.
+            schema (str): The schema of the table.
+            table (str): The table where the features are inserted.
+            features (Iterable[ogr.Feature]): The features to insert.
+            label (str): The text that identifies the request in the progress messages.
+
+        Returns:
+            int: The number of inserted features.
+        """
+        prefix = f"{label}: \nInserting item "  # Built once, only the counter changes between messages
+        n = 0
+        batch = []
+        for feature in prefetch(features, maxsize=2 * FEATURE_BATCH_SIZE):
+            batch.append(feature)
+            n += 1
+            if len(batch) >= FEATURE_BATCH_SIZE:
+                database.add_features_to_table(schema, table, batch)
+                batch = []
+            if n % PROGRESS_INTERVAL == 0:
+                self.update_progress.emit(prefix + str(n) + "...")
+        database.add_features_to_table(schema, table, batch)
+        if n % PROGRESS_INTERVAL:
+            self.update_progress.emit(prefix + str(n) + "...")  # Report the last item as well
+        return n
+
     def run(self):
+        # The processing modules (GDAL, pandas, psycopg2, reportlab...) are only imported when the
+        # process is executed, so they do not slow down the start of the user interface
+        import pandas as pd
+        import psycopg2
+        from src.modules.inspire import WFSService, AtomService
+        from src.modules.database import GeoDBManager
+        from src.modules.reports import Document
+
         self.execute_btn.setEnabled(False)
-        print("Execution started!")  # Implement your execution logic here
-        
-        inspire_log = Logger('src.modules.inspire', level='DEBUG', handlers=['console', 'file'])
-        capabilities_log = Logger('src.modules.capabilities', level='DEBUG', handlers=['console', 'file'])
-        database_log = Logger('src.modules.database', level='DEBUG', handlers=['console', 'file'])
-        reports_log =  Logger('src.modules.reports', level='DEBUG', handlers=['console', 'file'])
+        loggers = self.loggers()
+        inspire_log = loggers['src.modules.inspire'].logger
+        database_log = loggers['src.modules.database'].logger
+        inspire_log.info("Execution started!")
         
         
         # Open the JSON file and read the data
         data = None
         mapping = None
         try:
-            with open(self.config_file, 'r', encoding='UTF-8') as file:
-                data = json.load(file)
-            with open(self.mapping_file, 'r', encoding='UTF-8') as file:
-                mapping = json.load(file)
+            data = read_json(self.config_file)
+            mapping = read_json(self.mapping_file)
         except:
             pass
         
         if data is not None:
-            for region, info in data.items():
-                url = info.get('service').get('url')
-                parameters = info.get('service').get('parameters')
+            # A single connection is opened for the whole execution and reused by every region
+            database = GeoDBManager()
+            today = datetime.now().strftime('%Y%m%d')  # Same date for every report of the execution
+            try:
+                for region, info in data.items():
+                    try:
+                        # Each section is looked up once, and a missing section is treated as empty
+                        service = info.get('service') or {}
+                        db_info = info.get('database') or {}
+                        service_type = service.get('type')
+                        url = service.get('url')
+                        parameters = service.get('parameters') or {}
                 
-                schema = info.get('database').get('schema')
-                table = info.get('database').get('table')
-                table_backup = table + '_backup'
-                table_new = table + '_new'
+                        schema = db_info.get('schema')
+                        table = db_info.get('table')
+                        if not schema or not table:
+                            self.update_progress.emit(f"{region}: \nNo schema or table configured, skipping region")
+                            continue
+                        table_backup = table + '_backup'
+                        table_new = table + '_new'
                 
-                database = GeoDBManager()
-                if database.table_exists(schema, table_backup):
-                    database.cursor.execute(f'DROP TABLE "{table_backup}";')
-                if database.rename_table(schema, table, table_backup):
-                    old_items = database.get_count(schema, table_backup)
-                    table_new = table
-                else:
-                    old_items = database.get_count(schema, table)
+                        if database.table_exists(schema, table_backup):
+                            database.cursor.execute(f'DROP TABLE "{schema}"."{table_backup}";')
+                            database._save_changes()
+                        if database.rename_table(schema, table, table_backup):
+                            old_items = database.get_count(schema, table_backup)
+                            table_new = table
+                        else:
+                            old_items = database.get_count(schema, table)
+                        # The qualified names shown in the report are built once per region
+                        qualified_table = f'"{schema}".{table}'
+                        qualified_table_new = f'"{schema}".{table_new}'
                     
                 
-                today = f'{datetime.now().year}{datetime.now().month}{datetime.now().day}'
-                report_name = f'Informe_{region}_{today}'
-                report = Document(output_dir='reports', file_name=report_name)
-                report.add_text(f'INFORME DE DESCARGA NOMENCLATOR<br/>{region}', 'Heading1')
-                rows = []
+                        report_name = f'Informe_{region}_{today}'
+                        report = Document(output_dir=REPORTS_DIR, file_name=report_name)
+                        report.add_text(f'INFORME DE DESCARGA NOMENCLATOR<br/>{region}', 'Heading1')
+                        rows = []
                 
-                if info.get('service'):
-                    if info.get('service').get('type') == 'WFS':
-                        WFS = WFSService(source=url, name=region)
-                        report.add_text('1. Descarga de datos mediante servicio Inspire', 'Heading2')
-                        report.add_text("""Se han realizado peticiones en intervalos de un mes al servicio WFS Inspire de la Comunidad Autónoma, 
-                                        cuyas capacidades se pueden consultar a través del siguiente enlace:""")
-                        report.add_text(WFS.source + f"?service={WFS.service}&version={WFS.version}&request=GetCapabilities")
+                        if service:
+                            if service_type == 'WFS':
+                                WFS = WFSService(source=url, name=region)
+                                report.add_text('1. Descarga de datos mediante servicio Inspire', 'Heading2')
+                                report.add_text("""Se han realizado peticiones en intervalos de un mes al servicio WFS Inspire de la Comunidad Autónoma, 
+                                                cuyas capacidades se pueden consultar a través del siguiente enlace:""")
+                                report.add_text(WFS.source + f"?service={WFS.service}&version={WFS.version}&request=GetCapabilities")
                         
-                        for date_range in self.date_ranges:
-                            begin = date_range[0].isoformat()
-                            end = date_range[1].isoformat()
-                            features = WFS.get_feature(SQL_PREDICATE=f"beginLifespanVersion >= '{begin}' and beginLifespanVersion < '{end}'", **parameters)
-                            n = 0
-                            for feature in features:
-                                database.add_feature_to_table(schema, table_new, feature)
-                                n += 1
-                                self.update_progress.emit(f"{region} [{begin}/{end}]: \nInserting item {n}...")
-                            rows.append({'Fecha inicio': begin, 'Fecha fin': end, 'Insertados': n})
-                        self.update_progress.emit(f"{region}: \nAll items inserted, building report...")
-                    elif info.get('service').get('type') == 'ATOM':
-                        ATOM = AtomService(source=url, name=region)
-                        report.add_text('1. Descarga de datos mediante servicio Inspire', 'Heading2')
-                        report.add_text("""Se han realizado peticiones en intervalos de un mes al servicio ATOM Inspire de la Comunidad Autónoma:""")
-                        report.add_text(ATOM.source)
+                                for begin, end, predicate in self.date_filters:
+                                    features = WFS.get_feature(SQL_PREDICATE=predicate, **parameters)
+                                    n = self.insert_features(database, schema, table_new, features, f"{region} [{begin}/{end}]")
+                                    rows.append({'Fecha inicio': begin, 'Fecha fin': end, 'Insertados': n})
+                                self.update_progress.emit(f"{region}: \nAll items inserted, building report...")
+                            elif service_type == 'ATOM':
+                                ATOM = AtomService(source=url, name=region)
+                                report.add_text('1. Descarga de datos mediante servicio Inspire', 'Heading2')
+                                report.add_text("""Se han realizado peticiones en intervalos de un mes al servicio ATOM Inspire de la Comunidad Autónoma:""")
+                                report.add_text(ATOM.source)
                         
-                        typeNames = parameters.get('typeNames')
-                        if typeNames:
-                            features = ATOM.get_feature(typeNames=typeNames)
-                            n = 0
-                            for feature in features:
-                                database.add_feature_to_table(schema, table_new, feature)
-                                n += 1
-                                self.update_progress.emit(f"{region} [ATOM]: \nInserting item {n}...")
-                            self.update_progress.emit(f"{region} [ATOM]: \nAll items inserted, building report...")
+                                typeNames = parameters.get('typeNames')
+                                if typeNames:
+                                    features = ATOM.get_feature(typeNames=typeNames)
+                                    self.insert_features(database, schema, table_new, features, f"{region} [ATOM]")
+                                    self.update_progress.emit(f"{region} [ATOM]: \nAll items inserted, building report...")
                 
-                if len(rows) > 0:
-                    df = pd.DataFrame(rows)
-                    df['Fecha inicio'] = pd.to_datetime(df['Fecha inicio'])
-                    df['Año'] = df['Fecha inicio'].dt.year
-                    grouped_df = df.groupby('Año')
-                    for year in grouped_df:
-                        year[1].drop('Año', axis=1, inplace=True)
-                        report.add_table_from_df(f"Resumen de objetos geográficos extraídos mediante servicio de descarga.<br/>Año {year[0]}", year[1], 2, 1)
+                        if rows:
+                            df = pd.DataFrame(rows)
+                            df['Fecha inicio'] = pd.to_datetime(df['Fecha inicio'])
+                            df['Año'] = df['Fecha inicio'].dt.year
+                            # The tables of each year and the yearly totals come from the same grouping
+                            grouped_df = df.groupby('Año', sort=True)
+                            for year, year_df in grouped_df:
+                                report.add_table_from_df(f"Resumen de objetos geográficos extraídos mediante servicio de descarga.<br/>Año {year}", year_df.drop(columns='Año'), 2, 1)
+                            years = grouped_df['Insertados'].sum().reset_index()
+                            report.add_text('A continuación, se muestra un resumen estadístico por años de los objetos geográficos descargados del servicio:')
+                            report.add_plot_from_df('Resumen estadístico.', years, 'Año', 'Insertados')
+                        else:
+                            # ATOM services are downloaded at once, so there are no date ranges to summarize
+                            report.add_text('No se ha generado el resumen estadístico por años, ya que el servicio no se ha consultado por intervalos de fechas.')
                 
-                report.add_text('A continuación, se muestra un resumen estadístico por años de los objetos geográficos descargados del servicio:')
-                years = grouped_df['Insertados'].sum().reset_index()
-                report.add_plot_from_df('Resumen estadístico.', years, 'Año', 'Insertados')
-                report.add_text('2. Estado de la base de datos', 'Heading2')
-                report.add_text(f"""Se ha realizado una conexión a la tabla "{schema}".{table} de la base
-                                de datos Postgre <b>"NomenclatorGeograficoNacional"</b>, que ha devuelto un total de <b>{old_items}</b>
-                                objetos geográficos.""")
+                        report.add_text('2. Estado de la base de datos', 'Heading2')
+                        report.add_text(f"""Se ha realizado una conexión a la tabla {qualified_table} de la base
+                                        de datos Postgre <b>"NomenclatorGeograficoNacional"</b>, que ha devuelto un total de <b>{old_items}</b>
+                                        objetos geográficos.""")
                 
-                new_items = database.get_count(schema, table_new)
-                print(f'Items in new table: {new_items}')
-                report.add_text(f"""Se ha creado la tabla <b>"{schema}".{table_new}</b> para almacenar los resultados de la actualización,
-                                insertándose un total de <b>{new_items}</b> objetos geográficos.""")
-                report.save_pdf()
+                        new_items = database.get_count(schema, table_new)
+                        database_log.info(f'Items in new table: {new_items}')
+                        report.add_text(f"""Se ha creado la tabla <b>{qualified_table_new}</b> para almacenar los resultados de la actualización,
+                                        insertándose un total de <b>{new_items}</b> objetos geográficos.""")
+                        report.save_pdf()
                 
-                if mapping is not None:
-                    try:
-                        report.add_text('3. Control de cambios', 'Heading2')
-                        report.add_text(f'Se ha generado un reporte de control de cambios en formato Excel reports/{report_name}.xlsx')
-                        added, removed, changed, changed_geometries = database.compare_tables(schema, table, table_new, mapping.get(region), 'localid')
-                        database.export_summary_to_excel(added, removed, changed, changed_geometries, output_dir = 'reports', file_name = report_name)
+                        if mapping is not None:
+                            try:
+                                excel_path = (REPORTS_DIR / f'{report_name}.xlsx').as_posix()
+                                report.add_text('3. Control de cambios', 'Heading2')
+                                report.add_text(f'Se ha generado un reporte de control de cambios en formato Excel {excel_path}')
+                                added, removed, changed, changed_geometries = database.compare_tables(schema, table, table_new, mapping.get(region), 'localid')
+                                database.export_summary_to_excel(added, removed, changed, changed_geometries, output_dir = REPORTS_DIR, file_name = report_name)
                         
-                    except psycopg2.errors.UndefinedColumn as e:
+                            except psycopg2.errors.UndefinedColumn as e:
+                                database._rollback()  # The aborted transaction would make every following statement fail
+                                self.update_progress.emit(f"{region}: \n{e}")
+                    except Exception as e:
+                        # The connection is shared by all the regions, so the failed transaction is dropped before the next one
+                        database._rollback()
+                        database_log.error(f"{region}: {e}")
                         self.update_progress.emit(f"{region}: \n{e}")
-                
+        
+            finally:
+                database.close()
                 
         self.update_progress.emit(f"Execution completed")
         self.execute_btn.setEnabled(True)
@@ -1019,6 +1491,8 @@ class MainWindow(QWidget):
         Raises:
             FileNotFoundError: If any of the provided paths do not exist.
         """
+        # The application must exist before any widget is created
+        app = QApplication.instance() or QApplication(sys.argv)
         super().__init__()
         self.parent_dir = Path(importlib.util.find_spec('__init__').origin).parent
         config_file = os.path.join(self.parent_dir, 'config.json')
@@ -1033,7 +1507,7 @@ class MainWindow(QWidget):
         # Set up the user interface
         self.setup_ui()
         self.show()
-        sys.exit(APP.exec_())
+        sys.exit(app.exec_())
 
     def setup_ui(self):
         """
@@ -1189,16 +1663,16 @@ class MainWindow(QWidget):
 
         # Check if the file exists and then open it
         if os.path.isfile(file_path):
-            try:
-                # Open the file using the default program
-                if sys.platform == 'win32':  # For Windows
-                    os.startfile(file_path)
-                elif sys.platform == 'darwin':  # For macOS
-                    subprocess.run(['open', file_path])
-                else:  # For Linux/Unix
-                    subprocess.run(['xdg-open', file_path])
-            except Exception as e:
-                print(f"Error opening file: {e}")
+            # Open the file using the default program
+            if not QDesktopServices.openUrl(QUrl.fromLocalFile(file_path)):
+                print(f"Error opening file: {file_path}")
+
+    def close_editor(self) -> None:
+        """
+        Save the pending edits of the open JSON editor, if any, before it is replaced by a new one.
+        """
+        if getattr(self, 'editor', None) is not None:
+            self.editor.finish_saving()
 
     def open_config_editor(self) -> None:
         """
@@ -1207,6 +1681,7 @@ class MainWindow(QWidget):
         This method creates an instance of the JsonEditor class and shows the 
         editor window, allowing the user to modify the configuration settings.
         """
+        self.close_editor()
         self.editor = JsonEditor(json_file=self.services_config)
         self.editor.show()  # Show the JSON editor window
     
@@ -1218,6 +1693,7 @@ class MainWindow(QWidget):
             editor window, allowing the user to modify the mapping settings to
             compare two versions of the table.
             """
+            self.close_editor()
             self.editor = JsonEditor(json_file=self.table_mapping, is_mapping_file=True)
             self.editor.show()  # Show the JSON editor window
 
@@ -1236,15 +1712,15 @@ class MainWindow(QWidget):
         if self.interval_combo.currentText() == self.DAY_BY_DAY:
             ranges = day_ranges(self.start_date_field.text(), self.end_date_field.text())
         elif self.interval_combo.currentText() == self.CUSTOM_INTERVAL:
-            n = self.custom_interval_field
-            ranges = day_ranges(self.start_date_field, self.end_date_field, n)
+            n = self.custom_interval_field.value()
+            ranges = day_ranges(self.start_date_field.text(), self.end_date_field.text(), n)
         elif self.interval_combo.currentText() == self.MONTH_BY_MONTH:
             ranges = month_ranges(self.start_date_field.text(), self.end_date_field.text())
         # Worker thread
         if self.change_control_checkbox.isChecked():
-            self.worker = Worker(config_file=self.services_config, mapping_file=self.table_mapping, date_ranges=list(ranges), execute_btn=self.execute_button)
+            self.worker = Worker(config_file=self.services_config, mapping_file=self.table_mapping, date_ranges=ranges, execute_btn=self.execute_button)
         else:
-            self.worker = Worker(config_file=self.services_config, date_ranges=list(ranges), execute_btn=self.execute_button)
+            self.worker = Worker(config_file=self.services_config, date_ranges=ranges, execute_btn=self.execute_button)
             
         self.worker.update_progress.connect(self.update_status)
         self.status_label.setText("Process started...")
@@ -1,4 +1,15 @@
-WFS_PARAMETERS = {
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple
+
+
+class ParamSpec(NamedTuple):
+    """Description, type and requirement of a request parameter of a service. NamedTuples have no instance `__dict__`."""
+    description: str
+    type: str
+    required: bool
+
+_WFS_PARAMETERS = {
     '1.0.0': {    
         'service': {
             'description': 'Service name. Value is WFS.',
@@ -202,7 +213,7 @@ WFS_PARAMETERS = {
     }
 }
 
-WCS_PARAMETERS = {
+_WCS_PARAMETERS = {
     '1.0.0': {
         'service': {
             'description': 'Service name: Value is WCS.',
@@ -353,3 +364,69 @@ WCS_PARAMETERS = {
         }
     }
 }
+
+
+def _freeze_parameters(parameters: Dict[str, Dict[str, Dict]]) -> Mapping[str, Mapping[str, ParamSpec]]:
+    """
+    Convert the parameters of each version of a service into read-only mappings of `ParamSpec` tuples.
+
+    Each parameter takes a single tuple instead of a dictionary, and its fields are read as attributes
+    (e.g. `WFS_PARAMETERS['2.0.0']['bbox'].required`). Most parameters are identical in every version,
+    so equal specs are shared by all the versions and the names and texts are interned.
+
+    Parameters:
+        parameters (Dict[str, Dict[str, Dict]]): The description, type and requirement of each parameter, by version.
+
+    Returns:
+        Mapping[str, Mapping[str, ParamSpec]]: The same parameters, frozen.
+    """
+    shared_specs: Dict[ParamSpec, ParamSpec] = {}
+
+    def freeze_spec(spec: Dict) -> ParamSpec:
+        param_spec = ParamSpec(sys.intern(spec['description']), sys.intern(spec['type']), spec['required'])
+        return shared_specs.setdefault(param_spec, param_spec)
+
+    return MappingProxyType({
+        version: MappingProxyType({sys.intern(name): freeze_spec(spec) for name, spec in version_parameters.items()})
+        for version, version_parameters in parameters.items()
+    })
+
+WFS_PARAMETERS = _freeze_parameters(_WFS_PARAMETERS)
+WCS_PARAMETERS = _freeze_parameters(_WCS_PARAMETERS)
+del _WFS_PARAMETERS, _WCS_PARAMETERS
+
+
+def _required_parameters(parameters: Mapping[str, Mapping[str, ParamSpec]]) -> Mapping[str, Tuple[str, ...]]:
+    """
+    Collect, for each version of a service, the names of the required parameters that the caller must provide.
+
+    The `service`, `request` and `version` parameters are left out, since they are always written by the
+    service itself, so validating a request only walks the parameters that can actually be missing.
+
+    Parameters:
+        parameters (Mapping[str, Mapping[str, ParamSpec]]): The frozen parameters of each version.
+
+    Returns:
+        Mapping[str, Tuple[str, ...]]: The names of the required parameters, by version.
+    """
+    return MappingProxyType({
+        version: tuple(name for name, spec in version_parameters.items() if spec.required and name not in ('service', 'request', 'version'))
+        for version, version_parameters in parameters.items()
+    })
+
+WFS_REQUIRED_PARAMETERS = _required_parameters(WFS_PARAMETERS)
+WCS_REQUIRED_PARAMETERS = _required_parameters(WCS_PARAMETERS)
+
+
+def missing_parameters(required: Tuple[str, ...], args: Mapping[str, Any]) -> List[str]:
+    """
+    Get the required parameters that are not given (or are empty) in the arguments of a request.
+
+    Parameters:
+        required (Tuple[str, ...]): The names of the required parameters (see `WFS_REQUIRED_PARAMETERS`).
+        args (Mapping[str, Any]): The arguments of the request.
+
+    Returns:
+        List[str]: The names of the missing parameters, in declaration order.
+    """
+    return [key for key in required if not args.get(key)]
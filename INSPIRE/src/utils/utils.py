@@ -1,110 +1,318 @@
-from typing import List, Optional, Tuple, Any, Generator
+from typing import Dict, List, Optional, Tuple, Any, Final, Generator, Iterable, Iterator, Union
+from calendar import monthrange
 from datetime import datetime, timedelta
 
-from functools import reduce
-import requests
-import xmltodict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import io
+import queue
+import threading
 
 
-def deep_get(dictionary, keys:str, default:Optional[str]=None) -> Any:
+_MISSING: Final = object()  # Marks a key that does not exist in `deep_get`
+
+@lru_cache(maxsize=512)
+def split_path(keys: str) -> Tuple[str, ...]:
+    """
+    Split a slash separated path into its keys. The result is cached, as the same paths are used over and over.
+
+    Args:
+        keys (str): Path with the attributes separated with slash (e.g. gn:NamedPlace/gn:inspireId).
+
+    Returns:
+        Tuple[str, ...]: The keys of the path.
+    """
+    return tuple(keys.split("/"))
+
+def deep_get(dictionary: Any, keys: Union[str, Tuple[str, ...]], default: Any = None) -> Any:
     """
     Getter for iterating over a dictionary with the specified path (keys), this avoids Exceptions when a path does not exist
 
     Args:
-        keys (str): Path for the value we need to get, with the attributes separated with slash (e.g. gn:NamedPlace/gn:inspireId/base:Identifier/base:localId)
-        default (Optional[str], optional): Value to return if the path does not exist. Defaults to None.
+        dictionary (Any): The parsed document to read from, usually a dict.
+        keys (Union[str, Tuple[str, ...]]): Path for the value we need to get, with the attributes separated with slash (e.g. gn:NamedPlace/gn:inspireId/base:Identifier/base:localId),
+            or the keys of the path already split (see `split_path`), which avoids splitting it again in tight loops.
+        default (Any, optional): Value to return if the path does not exist. Defaults to None.
 
     Returns:
         Any: Value for the specified path. It can be any type (e.g. string, number, array, dict...)
     """
-    result = reduce(lambda d, key: d.get(key, default) if isinstance(d, dict) else default, keys.split("/"), dictionary)
-    if result == {'@xsi:nil': 'true'}:
-        result = None
-    return result if not isinstance(result, dict) else [result]
+    path = split_path(keys) if isinstance(keys, str) else keys
+    get = dict.get  # Bound once, so the method is not looked up on every level of the path
+    result = dictionary
+    for key in path:
+        if type(result) is not dict:
+            return default
+        result = get(result, key, _MISSING)
+        if result is _MISSING:
+            return default
+    if type(result) is dict:
+        # Nil elements are parsed as {'@xsi:nil': 'true'}; the length is checked first, so other dicts skip the lookup
+        if len(result) == 1 and result.get('@xsi:nil') == 'true':
+            return None
+        return [result]
+    return result
+
+REQUEST_TIMEOUT: Final[Tuple[int, int]] = (10, 90)  # Seconds to wait for the connection and for each read of the response
+_session = None  # Shared by every request, so the connections to the same host are reused
+RESPONSE_CACHE_SIZE: Final = 64  # Maximum number of responses kept for revalidation
+REQUEST_WORKERS: Final = 8  # Default number of simultaneous requests in `request_many`
+_response_cache: Dict[str, Tuple[str, str]] = {}  # URL -> (ETag, text), oldest first
+_response_cache_lock = threading.Lock()  # `request_many` calls `request` from several threads
+
+def get_session():
+    """
+    Get the HTTP session shared by the requests, creating it the first time it is needed.
+
+    The session keeps a pool of connections alive, so consecutive requests to the same host
+    do not repeat the TCP and TLS handshakes. It also asks explicitly for compressed responses,
+    as XML metadata usually compresses to a small fraction of its size; Brotli is only accepted
+    when a decoder for it is installed, since otherwise the body could not be decompressed.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        from importlib.util import find_spec
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+        brotli = find_spec('brotli') is not None or find_spec('brotlicffi') is not None
+        _session.headers['Accept-Encoding'] = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+    return _session
+
+def check_ows_exception(content: bytes) -> None:
+    """
+    Check whether an XML document is an OWS exception report, without parsing the whole document.
+
+    Only the root element is read for a regular document. If the root is an `ExceptionReport`,
+    the document is read until its first `Exception` element.
+
+    This is a deliberate relaxation: a document that is malformed after its root element is no
+    longer rejected here. The responses are parsed again by their consumers (e.g. BeautifulSoup
+    for the ATOM feeds), so the whole document is not parsed twice.
+
+    Parameters:
+        content (bytes): The XML document.
+
+    Raises:
+        ValueError: If the document is an OWS exception report.
+        lxml.etree.XMLSyntaxError: If the document is not valid XML up to its root element
+            (or, for an exception report, up to its first `Exception` element).
+    """
+    from lxml import etree
+
+    events = etree.iterparse(io.BytesIO(content), events=('start', 'end'))
+    _, root = next(events)
+    if etree.QName(root).localname != 'ExceptionReport':
+        return
+    for event, element in events:
+        if event == 'end' and etree.QName(element).localname == 'Exception':
+            raise ValueError(f"OWS Exception: {etree.tostring(element, encoding='unicode').strip()}")
 
 def request(url: str) -> Optional[str]:
     """
     Request XML metadata from the specified URL.
 
+    Responses with an ETag are kept, and requesting the same URL again sends it back in `If-None-Match`,
+    so an unchanged document is answered with an empty `304 Not Modified` and is neither downloaded
+    nor checked again. The cache can be emptied with `clear_request_cache`.
+
     Parameters:
         url (str): URL for the Capabilities metadata.
 
     Returns:
         Optional[str]: The response text if successful; otherwise, raises an exception.
     """
+    # requests is only needed here, so it is not loaded by the user interface,
+    # which imports this module for the date ranges
+    import requests
+
+    with _response_cache_lock:
+        cached = _response_cache.get(url)
+
     try:
-        response = requests.get(url, timeout=10000)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT, headers=headers)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
+        if cached and response.status_code == 304:
+            return cached[1]
 
         # Parse and check for errors in the XML
         try:
-            parsed_xml = xmltodict.parse(response.text)
-            error = deep_get(parsed_xml, 'ows:ExceptionReport/ows:Exception')
-            if error:
-                raise ValueError(f"OWS Exception: {error}")
-
-            return response.text
+            check_ows_exception(response.content)
+            # Decode the body directly instead of through `response.text`, which runs the charset
+            # detection over the whole document when the server does not declare an encoding
+            text = response.content.decode(response.encoding or 'utf-8', errors='replace')
+            etag = response.headers.get('ETag')
+            if etag:
+                with _response_cache_lock:
+                    _response_cache.pop(url, None)
+                    if len(_response_cache) >= RESPONSE_CACHE_SIZE:
+                        del _response_cache[next(iter(_response_cache))]
+                    _response_cache[url] = (etag, text)
+            return text
 
         except Exception as parse_error:
             raise ValueError(f"Error parsing XML response: {parse_error}")
 
     except requests.exceptions.RequestException as req_error:
         raise ConnectionError(f"Error during request: {req_error}")
+
+def clear_request_cache() -> None:
+    """
+    Forget the responses kept by `request`, so the next requests download the documents again.
+    """
+    with _response_cache_lock:
+        _response_cache.clear()
+
+def request_many(urls: Iterable[str], max_workers: Optional[int] = REQUEST_WORKERS) -> Iterator[Optional[str]]:
+    """
+    Request XML metadata from several URLs concurrently, through the shared session.
+
+    The requests are I/O bound, so they are sent from a pool of threads instead of one after the other.
+    The responses are yielded in the same order as the URLs, and an error raised by `request` for a URL
+    is raised when its response is reached.
+
+    Parameters:
+        urls (Iterable[str]): URLs for the XML metadata.
+        max_workers (Optional[int]): Maximum number of simultaneous requests. Defaults to `REQUEST_WORKERS`.
+
+    Yields:
+        Optional[str]: The response text of each URL.
+    """
+    urls = list(urls)
+    if not urls:
+        return
+    get_session()  # Create the shared session before the threads use it
+    with ThreadPoolExecutor(max_workers=min(max_workers or REQUEST_WORKERS, len(urls))) as executor:
+        yield from executor.map(request, urls)
             
 
-VALID_DATE_FORMATS = ['%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d', '%Y-%m-%d']
+# A tuple, as the results of `parse_date` are cached and would not follow changes to the formats
+VALID_DATE_FORMATS: Final[Tuple[str, ...]] = ('%d/%m/%Y', '%d-%m-%Y', '%Y/%m/%d', '%Y-%m-%d')
+
+# strptime compiles each format into a regular expression the first time it is used and caches it,
+# so the formats are compiled once here instead of during the first date validations
+for _date_format in VALID_DATE_FORMATS:
+    datetime.strptime(datetime(1970, 1, 1).strftime(_date_format), _date_format)
+del _date_format
+
+# The candidate formats for each separator and year position, so a value is only tried against
+# the formats it can match instead of raising a ValueError for each of the other ones
+_DATE_FORMAT_CANDIDATES: Final = {
+    (separator, year_first): tuple(fmt for fmt in VALID_DATE_FORMATS if separator in fmt and fmt.startswith('%Y') == year_first)
+    for separator in ('/', '-') for year_first in (True, False)
+}
+
+# The positions of the year, month and day in the zero padded values of the fixed width formats,
+# which are read with a few slices instead of going through `strptime`
+_FIXED_WIDTH_DATE_FORMATS: Final = {
+    '%d/%m/%Y': (slice(6, 10), slice(3, 5), slice(0, 2)),
+    '%d-%m-%Y': (slice(6, 10), slice(3, 5), slice(0, 2)),
+    '%Y/%m/%d': (slice(0, 4), slice(5, 7), slice(8, 10)),
+    '%Y-%m-%d': (slice(0, 4), slice(5, 7), slice(8, 10)),
+}
+
+def day_ranges(start_date: str, end_date: str, n: Optional[int] = 1) -> List[Tuple[datetime, datetime]]:
+    """
+    Builds the date ranges of `n` days between the specified start and end dates.
+
+    The ranges are computed by `day_ranges_np` and converted back to `datetime` objects.
+
+    Parameters:
+        start_date (str): The start date in string format.
+        end_date (str): The end date in string format.
+        n (int): The number of days in each range.
+
+    Returns:
+        (List[Tuple[datetime, datetime]]): A tuple containing the start and end of each date range.
+    """
+    return _to_datetime_ranges(*day_ranges_np(start_date, end_date, n))
+
+"""https://stackoverflow.com/questions/51293632/how-do-i-divide-a-date-range-into-months-in-python"""
+def month_ranges(begin: str, end: str) -> List[Tuple[datetime, datetime]]:
+    """
+    Builds the month ranges between the specified begin and end dates.
+
+    The ranges are computed by `month_ranges_np` and converted back to `datetime` objects.
+
+    Parameters:
+        begin (str): The start date in string format.
+        end (str): The end date in string format.
+
+    Returns:
+        (List[Tuple[datetime, datetime]]): A tuple containing the start and end of each month.
+    """
+    return _to_datetime_ranges(*month_ranges_np(begin, end))
 
-def day_ranges(start_date: str, end_date: str, n: Optional[int] = 1) -> Generator[Tuple[datetime, datetime], None, None]:
+def day_ranges_np(start_date: str, end_date: str, n: Optional[int] = 1) -> Tuple['np.ndarray', 'np.ndarray']:
     """
-    Generates date ranges of `n` days between the specified start and end dates.
+    Builds the same date ranges as `day_ranges`, as two NumPy arrays computed in a single vectorized operation.
+
+    NumPy is only imported when this function is called, so the user interface does not load it at start-up.
 
     Parameters:
         start_date (str): The start date in string format.
         end_date (str): The end date in string format.
         n (int): The number of days in each range.
 
-    Yields:
-        (Tuple[datetime, datetime]): A tuple containing the start and end of each date range.
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): The start and the end of each date range, as `datetime64[D]` arrays.
     """
+    import numpy as np
+
     # Validate the 'n' parameter
     if n <= 0:
         raise ValueError("The interval 'n' must be a positive integer.")
 
-    date_format = get_date_format(start_date)
-    start = datetime.strptime(start_date, date_format)
-    end = datetime.strptime(end_date, date_format)
-    interval = timedelta(days=n)
-
-    period_start = start
-    while period_start < end:
-        period_end = min(period_start + interval, end)
-        yield (period_start, period_end)
-        period_start = period_end
+    start, end = parse_date_range(start_date, end_date)
+    end = np.datetime64(end, 'D')
+    interval = np.timedelta64(n, 'D')
+    starts = np.arange(np.datetime64(start, 'D'), end, interval)
+    ends = np.minimum(starts + interval, end)
+    return starts, ends
 
-"""https://stackoverflow.com/questions/51293632/how-do-i-divide-a-date-range-into-months-in-python"""
-def month_ranges(begin: str, end: str) -> Generator[List[datetime], None, None]:
+def month_ranges_np(begin: str, end: str) -> Tuple['np.ndarray', 'np.ndarray']:
     """
-    Generates month ranges between the specified begin and end dates.
+    Builds the same month ranges as `month_ranges`, as two NumPy arrays computed in a single vectorized operation.
+
+    NumPy is only imported when this function is called, so the user interface does not load it at start-up.
 
     Parameters:
         begin (str): The start date in string format.
         end (str): The end date in string format.
 
-    Yields:
-        (Tuple[datetime, datetime]): A list containing the start and end of each month.
+    Returns:
+        (Tuple[np.ndarray, np.ndarray]): The start and the end of each month, as `datetime64[D]` arrays.
     """
-    date_format = get_date_format(begin)
-    begin_date = datetime.strptime(begin, date_format)
-    end_date = datetime.strptime(end, date_format)
+    import numpy as np
+
+    begin_date, end_date = parse_date_range(begin, end)
+    begin_day = np.datetime64(begin_date, 'D')
+    end_day = np.datetime64(end_date, 'D')
+    if begin_day > end_day:
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype='datetime64[D]')
 
-    while begin_date <= end_date:
-        next_month = begin_date.replace(day=1) + timedelta(days=31)  # Move to the next month
-        next_month = next_month.replace(day=1)
-        if next_month > end_date:
-            yield [begin_date, last_day_of_month(begin_date)]
-            break
-        yield (begin_date, last_day_of_month(begin_date))
-        begin_date = next_month
+    months = np.arange(begin_day.astype('datetime64[M]'), end_day.astype('datetime64[M]') + 1)
+    starts = months.astype('datetime64[D]')
+    starts[0] = begin_day  # The first range starts on the begin date, not on the first day of its month
+    ends = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return starts, ends
+
+def _to_datetime_ranges(starts: 'np.ndarray', ends: 'np.ndarray') -> List[Tuple[datetime, datetime]]:
+    """
+    Converts the `datetime64[D]` arrays of the ranges into a list of `datetime` tuples.
+
+    The arrays are cast to microseconds first, as `tolist` converts days into `date` objects, whose
+    `isoformat` would change the dates of the WFS filters.
+    """
+    return list(zip(starts.astype('datetime64[us]').tolist(), ends.astype('datetime64[us]').tolist()))
 
 def last_day_of_month(date: datetime) -> datetime:
     """
@@ -116,8 +324,7 @@ def last_day_of_month(date: datetime) -> datetime:
     Returns:
         datetime: The last day of the month.
     """
-    next_month = date.replace(day=28) + timedelta(days=4)  # Ensure we go to the next month
-    return next_month - timedelta(days=next_month.day)  # Go back to the last day of the month
+    return date.replace(day=monthrange(date.year, date.month)[1])  # monthrange returns (first weekday, number of days)
 
 def is_date(value: str) -> bool:
     """
@@ -129,7 +336,7 @@ def is_date(value: str) -> bool:
     Returns:
         bool: True if the value matches any valid date format, False otherwise.
     """
-    return any(validate(value, fmt) for fmt in VALID_DATE_FORMATS)
+    return parse_date(value)[0] is not None
 
 def get_date_format(value: str) -> Optional[str]:
     """
@@ -141,10 +348,68 @@ def get_date_format(value: str) -> Optional[str]:
     Returns:
         Optional[str]: The date format if matched, otherwise None.
     """
-    for fmt in VALID_DATE_FORMATS:
-        if validate(value, fmt):
-            return fmt
-    return None
+    return parse_date(value)[1]
+
+@lru_cache(maxsize=1024)
+def parse_date(value: str) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Parses the given string value with the first valid date format that matches it.
+
+    The value is only parsed with the formats that share its separator and year position, and the parsed
+    date is returned along with its format, so callers do not need to parse it again. Zero padded values
+    of the fixed width formats are read directly, and `strptime` is only used for the rest. The results
+    are cached, as `datetime` objects are immutable and the same dates are usually validated more than
+    once (e.g. by `is_date` and `get_date_format`).
+
+    Parameters:
+        value (str): The date string to parse.
+
+    Returns:
+        Tuple[Optional[datetime], Optional[str]]: The parsed date and its format, or (None, None) if no format matches.
+    """
+    if '/' in value:
+        separator = '/'
+    elif '-' in value:
+        separator = '-'
+    else:
+        return None, None
+    # A day (at most two digits) is followed by the separator within the first three characters, a year is not
+    for fmt in _DATE_FORMAT_CANDIDATES[separator, value.find(separator) > 2]:
+        positions = _FIXED_WIDTH_DATE_FORMATS.get(fmt)
+        if positions and len(value) == 10 and value.count(separator) == 2:
+            year, month, day = (value[position] for position in positions)
+            if year.isdigit() and month.isdigit() and day.isdigit():
+                try:
+                    return datetime(int(year), int(month), int(day)), fmt
+                except ValueError:
+                    continue  # Out of range (e.g. 31/02/2024), which strptime rejects too
+        # Values that are not zero padded (e.g. 1/2/2024) or formats without fixed width
+        try:
+            return datetime.strptime(value, fmt), fmt
+        except ValueError:
+            continue
+    return None, None
+
+def parse_date_range(begin: str, end: str) -> Tuple[datetime, datetime]:
+    """
+    Parses the begin and end dates of a range, which must share the same date format.
+
+    The format is detected once, while parsing the begin date, and the end date is parsed directly with it.
+
+    Parameters:
+        begin (str): The begin date in string format.
+        end (str): The end date in string format.
+
+    Returns:
+        Tuple[datetime, datetime]: The parsed begin and end dates.
+
+    Raises:
+        ValueError: If the begin date does not match any valid date format, or the end date does not match its format.
+    """
+    begin_date, date_format = parse_date(begin)
+    if begin_date is None:
+        raise ValueError(f"Unrecognized date format: {begin!r}")
+    return begin_date, datetime.strptime(end, date_format)
 
 def validate(value: str, pattern: str) -> bool:
     """
@@ -161,4 +426,76 @@ def validate(value: str, pattern: str) -> bool:
         datetime.strptime(value, pattern)
         return True
     except ValueError:
-        return False
\ No newline at end of file
+        return False
+
+
+_END_OF_ITEMS: Final = object()  # Marks the end of the items put in the queue by `prefetch`
+_PRODUCER_ERROR: Final = object()  # Marks an error put in the queue by `prefetch`, as (_PRODUCER_ERROR, exception)
+_PUT_TIMEOUT: Final = 0.1  # Seconds the producer of `prefetch` waits on a full queue before checking if it must stop
+
+def prefetch(items: Iterable[Any], maxsize: Optional[int] = 1000) -> Generator[Any, None, None]:
+    """
+    Iterates over `items` in a separate thread, yielding them as they are produced.
+
+    The producer thread keeps reading (e.g. downloading and parsing features) while the caller
+    processes the items already received, so both tasks overlap instead of running one after the other.
+    At most `maxsize` items are buffered, which bounds the memory used when the caller is slower.
+
+    If the caller stops early, it returns at once: the producer stops before reading the next item
+    and closes `items` if it is a generator.
+
+    Parameters:
+        items (Iterable[Any]): The items to iterate over, usually a generator.
+        maxsize (Optional[int]): The maximum number of items waiting to be processed.
+
+    Yields:
+        (Any): The items, in the same order.
+
+    Raises:
+        Exception: Any exception raised while producing the items is raised again in the caller.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    iterator = iter(items)
+
+    def put(item: Any) -> bool:
+        # Wait for room in the queue, unless the caller has stopped reading it
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    put(_END_OF_ITEMS)
+                    return
+                if not put(item):
+                    return
+        except Exception as e:
+            put((_PRODUCER_ERROR, e))
+        finally:
+            # The generator can only be closed from this thread, as it may be running here until now
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_ITEMS:
+                return
+            if type(item) is tuple and len(item) == 2 and item[0] is _PRODUCER_ERROR:
+                raise item[1]
+            yield item
+    finally:
+        # If the caller stops early, the producer notices it after its current item and stops by itself
+        stop.set()
@@ -1,22 +1,73 @@
 import json
 import os
 import sys
+import threading
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QLineEdit, 
-                            QTableWidget, QTableWidgetItem, QComboBox, QLabel, QMessageBox, QTabWidget, 
+                            QTableWidget, QTableWidgetItem, QTableView, QComboBox, QLabel, QMessageBox, QTabWidget, 
                             QTextEdit, QGridLayout, QFileDialog, QGroupBox, QCheckBox)
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl, pyqtSlot, pyqtSignal, QThread, Qt
+# QtWebEngineWidgets must be imported before the QApplication is created, so it cannot be deferred to the first map
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineProfile
+from PyQt5.QtCore import QUrl, pyqtSlot, pyqtSignal, QThread, Qt, QAbstractTableModel, QModelIndex, QSignalBlocker
 from PyQt5.QtGui import QKeySequence, QFont
 
 
-from main import main_process
 from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard json module is used if it is not installed
+    orjson = None
 
 
 MIN_IMAGE_VALUE = -32768
 MAX_IMAGE_VALUE = 32767
 
+# The map shown by every MapWindow, next to this file, resolved and checked once
+MAP_HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "map.html")
+MAP_HTML_EXISTS = os.path.exists(MAP_HTML_PATH)
+
+def replace_file(path, content):
+    # Write to a temporary file next to the target and rename it over the target, so a crash
+    # while saving never leaves a half written project file
+    if isinstance(content, str):
+        content = content.encode('UTF-8')
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def dump_config(config):
+    # Serialize the regions of a project to UTF-8 bytes, with orjson if it is installed;
+    # both serializers produce the same layout, with an indentation of two spaces
+    if orjson:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2, ensure_ascii=False).encode('UTF-8')
+
+map_profile = None  # Browser profile shared by the maps of every region
+
+def get_map_profile():
+    # The profile (and its HTTP cache) is created once, with the application as parent so it outlives the pages,
+    # and every map reuses the resources already loaded instead of starting from an empty default profile
+    global map_profile
+    if map_profile is None:
+        map_profile = QWebEngineProfile("sentinel-map", QApplication.instance())
+        map_profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+    return map_profile
+
+# Comments and settings of each section of the project .env file, in the order they are written
+ENV_FILE_SECTIONS = (
+    (('# CREDENTIALS', '# https://dataspace.copernicus.eu/', '# https://documentation.dataspace.copernicus.eu/Registration.html'),
+     ('OPENEO_AUTH_CLIENT_ID', 'OPENEO_AUTH_CLIENT_SECRET', 'OPENEO_AUTH_PROVIDER_ID')),
+    (('# S3_CREDENTIALS', '# https://documentation.dataspace.copernicus.eu/APIs/S3.html', '# https://eodata-s3keysmanager.dataspace.copernicus.eu/panel/s3-credentials'),
+     ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'TOKEN_USERNAME', 'TOKEN_PASSWORD')),
+    (('# EMAIL',),
+     ('SMTP_HOST', 'SMTP_PORT', 'FROM', 'TO', 'SUBJECT')),
+    (('# PROJECT_SETTINGS',),
+     ('SERVICE_DIR', 'THREADS')),
+    (('# IMAGE_SETTINGS',),
+     ('CRS', 'MAX_CLOUD_COVER', 'DAYS_OFFSET', 'ONLY_COMPLETE', 'ONLY_LATEST')),
+)
+
 class MapWindow(QMainWindow):
     # Define a signal to pass selected features to the parent window
     selected_tiles_signal = pyqtSignal(list) # Sending the list of tiles
@@ -33,15 +84,15 @@ class MapWindow(QMainWindow):
 
         # Create a QWebEngineView to display the OpenLayers map
         self.browser = QWebEngineView()
+        self.browser.setPage(QWebEnginePage(get_map_profile(), self.browser))
         self.setCentralWidget(self.browser)
 
         # Load the local HTML file
-        html_file_path = os.path.abspath("map.html")  # Update with your file path
-        if os.path.exists(html_file_path):
+        if MAP_HTML_EXISTS:
             self.browser.page().loadFinished.connect(self.on_map_load)
-            self.browser.setUrl(QUrl.fromLocalFile(html_file_path))
+            self.browser.setUrl(QUrl.fromLocalFile(MAP_HTML_PATH))
         else:
-            QMessageBox.warning(self, "Error", f"{html_file_path} does not exist.")
+            QMessageBox.warning(self, "Error", f"{MAP_HTML_PATH} does not exist.")
 
         # Create a button to save selected features
         self.save_button = QPushButton("Save", self)
@@ -61,10 +112,10 @@ class MapWindow(QMainWindow):
         
     @pyqtSlot(bool)
     def on_map_load(self):
-        # JavaScript code to highlight the tiles
+        # JavaScript code to highlight the tiles, sent to the page in a single call
+        # (json.dumps writes the whole list as a JavaScript array literal, with any quotes escaped)
         if self.selected_tiles:
-            tiles_js = ",".join([f"'{tile}'" for tile in self.selected_tiles])
-            self.browser.page().runJavaScript(f'selectTilesOnMap([{tiles_js}]);')
+            self.browser.page().runJavaScript(f'selectTilesOnMap({json.dumps(self.selected_tiles)});')
             self.map_loaded_signal.emit()
             
 
@@ -82,8 +133,7 @@ class MapWindow(QMainWindow):
             self.selected_tiles_signal.emit(selected_tiles)
             # Emit the signal to open the enhancement window
             self.map_closed_signal.emit(self.region_name)
-            # Close the MapWindow after emitting the signals
-            self.close()
+            # The window is kept open, as it is embedded in the tab of its region and reused
         else:
             QMessageBox.warning(self, "Error", "No features selected.")
             
@@ -109,7 +159,9 @@ class RegionInputWindow(QWidget):
         self.season_table.setColumnCount(len(columns))
         self.season_table.setHorizontalHeaderLabels(columns)
         
-        # Populate the table with season names
+        # Populate the table with season names, without repainting or signalling after each cell
+        self.season_table.setUpdatesEnabled(False)
+        self.season_table.blockSignals(True)
         for i, season in enumerate(seasons):
             season_cell = QTableWidgetItem(season)
             season_cell.setFlags(season_cell.flags() & ~Qt.ItemIsEditable)
@@ -123,7 +175,8 @@ class RegionInputWindow(QWidget):
                 self.season_table.setItem(i, 2, QTableWidgetItem(str(rgb_max)))
                 self.season_table.setItem(i, 3, QTableWidgetItem(str(nirgb_min)))
                 self.season_table.setItem(i, 4, QTableWidgetItem(str(nirgb_max)))
-            
+        self.season_table.blockSignals(False)
+        self.season_table.setUpdatesEnabled(True)
         
         layout.addWidget(self.season_table)
 
@@ -137,13 +190,13 @@ class RegionInputWindow(QWidget):
         try:
             # Create a data structure for seasonal data
             enhancement_data = {}
+            defaults = (MIN_IMAGE_VALUE, MAX_IMAGE_VALUE, MIN_IMAGE_VALUE, MAX_IMAGE_VALUE)
             for row in range(self.season_table.rowCount()):
                 season = self.season_table.item(row, 0).text()
-                # Safely get values from the table, defaulting to 0 if empty
-                rgb_min = int(self.season_table.item(row, 1).text()) if self.season_table.item(row, 1) else MIN_IMAGE_VALUE
-                rgb_max = int(self.season_table.item(row, 2).text()) if self.season_table.item(row, 2) else MAX_IMAGE_VALUE
-                nirgb_min = int(self.season_table.item(row, 3).text()) if self.season_table.item(row, 3) else MIN_IMAGE_VALUE
-                nirgb_max = int(self.season_table.item(row, 4).text()) if self.season_table.item(row, 4) else MAX_IMAGE_VALUE
+                # Safely get values from the table, defaulting to the image limits if empty.
+                # Each cell is fetched once and the four values are read in a single pass
+                items = (self.season_table.item(row, column) for column in range(1, 5))
+                rgb_min, rgb_max, nirgb_min, nirgb_max = (int(item.text()) if item else default for item, default in zip(items, defaults))
 
                 enhancement_data[season] = {
                     'RGB': {'min': rgb_min, 'max': rgb_max},
@@ -152,21 +205,91 @@ class RegionInputWindow(QWidget):
 
             # Emit signal to parent with new region data
             self.region_added_signal.emit(self.region_name, enhancement_data)
-
-            self.close()  # Close the input window
+            # The window is kept open, as it is embedded in the tab of its region and reused
 
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Please enter valid integer values for RGB and NirGB.")
             
             
+class RegionTableModel(QAbstractTableModel):
+    # Shows the regions of the project straight from the `regions` dictionary, so the table
+    # does not need a QTableWidgetItem per cell
+    columns = ['Region Name', 'Selected Tiles', 'Enhancement Data']
+
+    def __init__(self, regions, parent=None):
+        super().__init__(parent)
+        self.regions = regions  # Shared with the project window, not copied
+        self.region_names = []  # Region shown in each row
+        self.region_rows = {}  # Row of each region, so it is found without scanning the rows
+        self.region_texts = {}  # Tiles and enhancement data of each region, formatted once until they change
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.region_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        region_name = self.region_names[index.row()]
+        if index.column() == 0:
+            return region_name
+        texts = self.region_texts.get(region_name)
+        if texts is None:
+            # Kept in the model, not in the regions, so the cached texts are not saved to config.json
+            data = self.regions.get(region_name, {})
+            texts = self.region_texts[region_name] = (str(data.get('tiles', [])), json.dumps(data.get('enhancement_data', {})))
+        return texts[index.column() - 1]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section]
+        return super().headerData(section, orientation, role)
+
+    def set_region_names(self, region_names):
+        # Replace all the rows at once
+        self.beginResetModel()
+        self.region_names = list(region_names)
+        self.region_rows = {region_name: row for row, region_name in enumerate(self.region_names)}
+        self.region_texts.clear()
+        self.endResetModel()
+
+    def add_region(self, region_name):
+        row = len(self.region_names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.region_names.append(region_name)
+        self.region_rows[region_name] = row
+        self.endInsertRows()
+        return row
+
+    def region_name(self, row):
+        return self.region_names[row]
+
+    def row_of(self, region_name):
+        return self.region_rows.get(region_name, -1)
+
+    def region_changed(self, region_name):
+        # Refresh the tiles and enhancement data shown for the region
+        self.region_texts.pop(region_name, None)
+        row = self.row_of(region_name)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 1), self.index(row, len(self.columns) - 1))
+
+
 class ProjectWindow(QMainWindow):
     worker = None
+    close_when_finished = False  # Set when the window is closed while the process is stopping
     
     def __init__(self):
         super().__init__()
         self.current_project_path = None  # Store the current project directory path
         self.current_project_name = None  # Store the current project name
 
+        self.regions = {}
+        self.dirty_regions = set()  # Regions changed since the project was last saved
+        self.region_tabs = {}  # Tabs of each region already shown, so the map is not loaded again
+
         self.setWindowTitle("Sentinel 2 Image Processing")
         self.setGeometry(100, 100, 800, 600)
 
@@ -211,8 +334,6 @@ class ProjectWindow(QMainWindow):
         # Add menu bar
         self.create_menu_bar()
         
-        self.regions = {}
-        
     def create_credentials_tab(self):
         credentials_group = QGroupBox("Credentials")
         credentials_layout = QGridLayout()
@@ -368,13 +489,13 @@ class ProjectWindow(QMainWindow):
         layout.addLayout(new_region_layout)
 
         # Summary table
-        columns = ['Region Name', 'Selected Tiles', 'Enhancement Data']
-        self.region_table = QTableWidget()
+        self.region_model = RegionTableModel(self.regions, self)
+        self.region_table = QTableView()
         self.region_table.setFixedHeight(150)
-        self.region_table.setColumnCount(len(columns))
-        self.region_table.setHorizontalHeaderLabels(columns)
-        self.region_table.itemSelectionChanged.connect(self.handle_table_item_changed)
-        self.region_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.region_table.setModel(self.region_model)
+        self.region_table.horizontalHeader().setStretchLastSection(True)
+        self.region_table.selectionModel().selectionChanged.connect(self.handle_table_item_changed)
+        self.region_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.region_table)
         
         self.region_tab_widget = QTabWidget()
@@ -419,7 +540,7 @@ class ProjectWindow(QMainWindow):
             config_file = os.path.join(project_dir, "config.json")
             if os.path.exists(config_file):
                 # Open and parse the config.json
-                with open(config_file, 'r') as f:
+                with open(config_file, 'r', encoding='UTF-8') as f:
                     config_data = json.load(f)
                 self.load_config_data(config_data)
                 self.current_project_path = project_dir  # Store the project path
@@ -438,8 +559,7 @@ class ProjectWindow(QMainWindow):
             # Create config.json based on self.seasons
             config_file = os.path.join(project_dir, "config.json")
             
-            with open(config_file, 'w') as f:
-                json.dump(self.regions, f, indent=4)
+            replace_file(config_file, dump_config(self.regions))
             
             QMessageBox.information(self, "Success", f"New project created at {project_dir}")
 
@@ -455,13 +575,15 @@ class ProjectWindow(QMainWindow):
 
         config_file = os.path.join(self.current_project_path, "config.json")
         # Save the project data to config.json
-        with open(config_file, 'w') as f:
-            json.dump(self.regions, f, indent=4)
+        replace_file(config_file, dump_config(self.regions))
 
         self.save_project_settings_to_env()
         
         QMessageBox.information(self, "Success", f"Project saved successfully")
-        self.load_config_data(self.regions)
+        # Only the rows of the changed regions are refreshed, instead of rebuilding the table
+        for region_name in self.dirty_regions:
+            self.region_model.region_changed(region_name)
+        self.dirty_regions.clear()
         
     def load_config_data(self, config_data):
         """
@@ -469,162 +591,103 @@ class ProjectWindow(QMainWindow):
         :param config_data: A dictionary parsed from config.json
         """
         if config_data:
-            self.region_table.setRowCount(0)
-            if config_data:
-                # Load regions and enhancement data into the interface
-                print(f"Loading data from config.json file...")
-                for region_name, data in config_data.items():
-                    # You can update your UI with the loaded data here
-                    self.regions[region_name] = data
-                    row_position = self.region_table.rowCount()
-                    self.region_table.insertRow(row_position)
-                    self.region_table.setItem(row_position, 0, QTableWidgetItem(region_name))
-                    tiles = self.regions[region_name]['tiles']
-                    self.region_table.setItem(self.get_region_row_number(region_name), 1, QTableWidgetItem(str(tiles)))
-                    enhancement_data = self.regions[region_name]['enhancement_data']
-                    self.region_table.setItem(self.get_region_row_number(region_name), 2, QTableWidgetItem(json.dumps(enhancement_data)))
-                    self.region_input.clear()
-                self.region_table.horizontalHeader().setStretchLastSection(True)
-                self.region_table.selectRow(0)
+            # Load regions and enhancement data into the interface
+            print(f"Loading data from config.json file...")
+            if config_data is not self.regions:
+                self.regions.update(config_data)
+            # The model reads the rows from self.regions, so the table is refreshed in a single reset,
+            # painted once, and the first row is only selected afterwards. The selection signals are
+            # blocked meanwhile, so the region tabs are only built for that final selection
+            self.region_table.setUpdatesEnabled(False)
+            blocker = QSignalBlocker(self.region_table.selectionModel())
+            self.clear_region_tabs()
+            self.region_model.set_region_names(config_data.keys())
+            self.region_input.clear()
+            blocker.unblock()
+            self.region_table.setUpdatesEnabled(True)
+            self.region_table.selectRow(0)
             
     def load_project_settings_from_env(self):
         """
         Load project-specific settings from the .env file and populate relevant UI fields
         """
         load_dotenv(dotenv_path=os.path.join(self.current_project_path, '.env'), override=True)
-        # Example of loading environment variables and setting UI components
-        openeo_auth_client_id = os.getenv("OPENEO_AUTH_CLIENT_ID")
-        openeo_auth_client_secret = os.getenv("OPENEO_AUTH_CLIENT_SECRET")
-        openeo_provider = os.getenv("OPENEO_AUTH_PROVIDER_ID")
-        aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-        aws_access_secret = os.getenv("AWS_SECRET_ACCESS_KEY")
-        token_username = os.getenv("TOKEN_USERNAME")
-        token_password = os.getenv("TOKEN_PASSWORD")
-        
-        if openeo_auth_client_id:
-            self.client_id_input.setText(openeo_auth_client_id)
-        if openeo_auth_client_secret:
-            self.client_secret_input.setText(openeo_auth_client_secret)
-        if openeo_provider:
-            self.provider_id_input.setText(openeo_provider)
-        if aws_access_key:
-            self.aws_access_key_input.setText(aws_access_key)
-        if aws_access_secret:
-            self.aws_secret_access_key_input.setText(aws_access_secret)
-        if token_username:
-            self.token_username_input.setText(token_username)
-        if token_password:
-            self.token_password_input.setText(token_password)
-            
-        smtp_host = os.getenv("SMTP_HOST")
-        smtp_port = os.getenv("SMTP_PORT")
-        email_from = os.getenv("FROM")
-        email_to = os.getenv("TO")
-        email_subject = os.getenv("SUBJECT")
-        
-        if smtp_host:
-            self.smtp_host_input.setText(smtp_host)
-        if smtp_port:
-            self.smtp_port_input.setText(smtp_port)
-        if email_from:
-            self.from_input.setText(email_from)
-        if email_to:
-            self.to_input.setText(email_to)
-        if email_subject:
-            self.subject_input.setText(email_subject)
-        
-        
-        crs = os.getenv("CRS")
-        service_dir = os.getenv("SERVICE_DIR")
-        threads = os.getenv("THREADS")
-        max_cloud_cover = os.getenv("MAX_CLOUD_COVER")
-        days_offset = os.getenv("DAYS_OFFSET")
-        only_complete = True if os.getenv("ONLY_COMPLETE") == 'True' else False
-        only_latest = True if os.getenv("ONLY_LATEST") == 'True' else False
-        
-
-        if crs:
-            self.crs_input.setText(crs)
-        if service_dir:
-            self.service_dir_input.setText(service_dir)
-        if threads:
-            self.threads_input.setText(threads)
-        if max_cloud_cover:
-            self.max_cloud_cover_input.setText(max_cloud_cover)
-        if days_offset:
-            self.days_offset_input.setText(days_offset)
-        if only_complete:
-            self.only_complete.setChecked(only_complete)
-        if only_latest:
-            self.only_latest.setChecked(only_latest)
+        # Read the environment once, and fill each field from its variable
+        env = dict(os.environ)
+        text_fields = {
+            'OPENEO_AUTH_CLIENT_ID': self.client_id_input,
+            'OPENEO_AUTH_CLIENT_SECRET': self.client_secret_input,
+            'OPENEO_AUTH_PROVIDER_ID': self.provider_id_input,
+            'AWS_ACCESS_KEY_ID': self.aws_access_key_input,
+            'AWS_SECRET_ACCESS_KEY': self.aws_secret_access_key_input,
+            'TOKEN_USERNAME': self.token_username_input,
+            'TOKEN_PASSWORD': self.token_password_input,
+
+            'SMTP_HOST': self.smtp_host_input,
+            'SMTP_PORT': self.smtp_port_input,
+            'FROM': self.from_input,
+            'TO': self.to_input,
+            'SUBJECT': self.subject_input,
+
+            'CRS': self.crs_input,
+            'SERVICE_DIR': self.service_dir_input,
+            'THREADS': self.threads_input,
+            'MAX_CLOUD_COVER': self.max_cloud_cover_input,
+            'DAYS_OFFSET': self.days_offset_input,
+        }
+        for key, field in text_fields.items():
+            value = env.get(key)
+            if value:
+                field.setText(value)
+
+        for key, checkbox in (('ONLY_COMPLETE', self.only_complete), ('ONLY_LATEST', self.only_latest)):
+            if env.get(key) == 'True':
+                checkbox.setChecked(True)
             
     def save_project_settings_to_env(self):
         """
         Save project-specific settings to the .env file based on the current UI field values.
         """
         # Collect settings from UI components
-        openeo_auth_client_id = self.client_id_input.text()
-        openeo_auth_client_secret = self.client_secret_input.text()
-        openeo_provider = self.provider_id_input.text()
-        aws_access_key = self.aws_access_key_input.text()
-        aws_access_secret = self.aws_secret_access_key_input.text()
-        token_username = self.token_username_input.text()
-        token_password = self.token_password_input.text()
-
-        smtp_host = self.smtp_host_input.text()
-        smtp_port = self.smtp_port_input.text()
-        email_from = self.from_input.text()
-        email_to = self.to_input.toPlainText()
-        email_subject = self.subject_input.text()
-        
-        crs = self.crs_input.text()
-        service_dir = self.service_dir_input.text()
-        threads = self.threads_input.text()
-        max_cloud_cover = self.max_cloud_cover_input.text()
-        days_offset = self.days_offset_input.text()
+        settings = {
+            'OPENEO_AUTH_CLIENT_ID': self.client_id_input.text(),
+            'OPENEO_AUTH_CLIENT_SECRET': self.client_secret_input.text(),
+            'OPENEO_AUTH_PROVIDER_ID': self.provider_id_input.text(),
+            'AWS_ACCESS_KEY_ID': self.aws_access_key_input.text(),
+            'AWS_SECRET_ACCESS_KEY': self.aws_secret_access_key_input.text(),
+            'TOKEN_USERNAME': self.token_username_input.text(),
+            'TOKEN_PASSWORD': self.token_password_input.text(),
+
+            'SMTP_HOST': self.smtp_host_input.text(),
+            'SMTP_PORT': self.smtp_port_input.text(),
+            'FROM': self.from_input.text(),
+            'TO': self.to_input.toPlainText(),
+            'SUBJECT': self.subject_input.text(),
+
+            'SERVICE_DIR': self.service_dir_input.text(),
+            'THREADS': self.threads_input.text(),
+
+            'CRS': self.crs_input.text(),
+            'MAX_CLOUD_COVER': self.max_cloud_cover_input.text(),
+            'DAYS_OFFSET': self.days_offset_input.text(),
+            'ONLY_COMPLETE': str(self.only_complete.isChecked()),
+            'ONLY_LATEST': str(self.only_latest.isChecked()),
+        }
 
         # Define the content to be written to the .env file
-        env_content = f"""\
-# CREDENTIALS
-# https://dataspace.copernicus.eu/
-# https://documentation.dataspace.copernicus.eu/Registration.html
-OPENEO_AUTH_CLIENT_ID={openeo_auth_client_id}
-OPENEO_AUTH_CLIENT_SECRET={openeo_auth_client_secret}
-OPENEO_AUTH_PROVIDER_ID={openeo_provider}
-
-# S3_CREDENTIALS
-# https://documentation.dataspace.copernicus.eu/APIs/S3.html
-# https://eodata-s3keysmanager.dataspace.copernicus.eu/panel/s3-credentials
-AWS_ACCESS_KEY_ID={aws_access_key}
-AWS_SECRET_ACCESS_KEY={aws_access_secret}
-TOKEN_USERNAME={token_username}
-TOKEN_PASSWORD={token_password}
-
-# EMAIL
-SMTP_HOST={smtp_host}
-SMTP_PORT={smtp_port}
-FROM={email_from}
-TO={email_to}
-SUBJECT={email_subject}
-
-# PROJECT_SETTINGS
-SERVICE_DIR={service_dir}
-THREADS={threads}
-
-# IMAGE_SETTINGS
-CRS={crs}
-MAX_CLOUD_COVER={max_cloud_cover}
-DAYS_OFFSET={days_offset}
-ONLY_COMPLETE={self.only_complete.isChecked()}
-ONLY_LATEST={self.only_latest.isChecked()}
-        """
+        lines = []
+        for comments, keys in ENV_FILE_SECTIONS:
+            lines.extend(comments)
+            lines.extend(f'{key}={settings[key]}' for key in keys)
+            lines.append('')
+        env_content = '\n'.join(lines)
 
         # Write to the .env file
         try:
             env_file = os.path.join(self.current_project_path, ".env")
-            with open(env_file, 'w', encoding='UTF-8') as f:
-                    f.write(env_content)
-                    load_dotenv(dotenv_path=env_file, override=True)
+            replace_file(env_file, env_content)
+            # The values are already known, so they are set directly instead of parsing the file again
+            os.environ.update(settings)
             print("Settings saved to .env file successfully.")
         except Exception as e:
             QMessageBox.critical(self, f"Failed to save settings to .env file: {e}")
@@ -633,51 +696,60 @@ ONLY_LATEST={self.only_latest.isChecked()}
         region_name = self.region_input.text()
         if region_name and region_name not in self.regions:
             self.regions[region_name] = {'tiles': [], 'enhancement_data': {}}
-            row_position = self.region_table.rowCount()
-            self.region_table.insertRow(row_position)
-            self.region_table.setItem(row_position, 0, QTableWidgetItem(region_name))
+            self.dirty_regions.add(region_name)
+            row_position = self.region_model.add_region(region_name)
             self.region_table.selectRow(row_position)
             self.region_input.clear()
         
     def get_region_row_number(self, region_name):
-        for row in range(self.region_table.rowCount()):
-            if self.region_table.item(row, 0).text() == region_name:
-                return row
-        return -1  # Return -1 if the region is not found
+        return self.region_model.row_of(region_name)  # Return -1 if the region is not found
     
-    def handle_table_item_changed(self):
+    def handle_table_item_changed(self, selected=None, deselected=None):
         self.update_tab()
 
     def update_tab(self):
-        row = self.region_table.currentRow()
+        row = self.region_table.currentIndex().row()
         if row >= 0:
-            selected_region = self.region_table.item(row, 0).text()
+            selected_region = self.region_model.region_name(row)
             # Clear existing tabs and populate them with selected tiles and enhancement data
             self.region_tab_widget.clear()
             if selected_region:
-                # Tab for Selected Tiles
-                tiles_tab = QWidget()
-                tiles_layout = QVBoxLayout()
-                self.open_map_window()
-                tiles_layout.addWidget(self.map_window)
-                tiles_tab.setLayout(tiles_layout)
-
-                # Tab for Enhancement Data
-                enhancement_tab = QWidget()
-                enhancement_layout = QVBoxLayout()
-                self.open_enhancement_window(selected_region)
-                enhancement_layout.addWidget(self.enhancement_window)
-                enhancement_tab.setLayout(enhancement_layout)
-                
+                region_tabs = self.region_tabs.get(selected_region)
+                if region_tabs is None:
+                    # Tab for Selected Tiles
+                    tiles_tab = QWidget()
+                    tiles_layout = QVBoxLayout()
+                    self.open_map_window()
+                    tiles_layout.addWidget(self.map_window)
+                    tiles_tab.setLayout(tiles_layout)
+
+                    # Tab for Enhancement Data
+                    enhancement_tab = QWidget()
+                    enhancement_layout = QVBoxLayout()
+                    self.open_enhancement_window(selected_region)
+                    enhancement_layout.addWidget(self.enhancement_window)
+                    enhancement_tab.setLayout(enhancement_layout)
+
+                    region_tabs = (tiles_tab, enhancement_tab, self.map_window, self.enhancement_window)
+                    self.region_tabs[selected_region] = region_tabs
+                tiles_tab, enhancement_tab, self.map_window, self.enhancement_window = region_tabs
 
                 # Add tabs to the QTabWidget
                 self.region_tab_widget.addTab(tiles_tab, "Selected Tiles")
                 self.region_tab_widget.addTab(enhancement_tab, "Enhancement Data")
 
+    def clear_region_tabs(self):
+        # Forget the tabs of the previous regions, e.g. when another project is loaded
+        self.region_tab_widget.clear()
+        for tiles_tab, enhancement_tab, _, _ in self.region_tabs.values():
+            tiles_tab.deleteLater()
+            enhancement_tab.deleteLater()
+        self.region_tabs.clear()
+
     def open_map_window(self):
-        selected_row = self.region_table.currentRow()
+        selected_row = self.region_table.currentIndex().row()
         if selected_row >= 0:
-            region_name = self.region_table.item(selected_row, 0).text()
+            region_name = self.region_model.region_name(selected_row)
             selected_tiles = self.regions.get(region_name, {}).get('tiles', [])
             self.map_window = MapWindow(selected_tiles, region_name)
             self.map_window.selected_tiles_signal.connect(self.handle_selected_tiles)
@@ -686,10 +758,11 @@ ONLY_LATEST={self.only_latest.isChecked()}
 
     @pyqtSlot(list)
     def handle_selected_tiles(self, selected_tiles):
-        selected_row = self.region_table.currentRow()
+        selected_row = self.region_table.currentIndex().row()
         if selected_row >= 0:
-            region_name = self.region_table.item(selected_row, 0).text()
+            region_name = self.region_model.region_name(selected_row)
             self.regions[region_name]['tiles'] = selected_tiles
+            self.dirty_regions.add(region_name)
             self.save_project()
             
     def open_enhancement_window(self, region_name):
@@ -700,22 +773,40 @@ ONLY_LATEST={self.only_latest.isChecked()}
     @pyqtSlot(str, dict)
     def handle_enhancement_data(self, region_name, enhancement_data):
         self.regions[region_name]['enhancement_data'] = enhancement_data
+        self.dirty_regions.add(region_name)
         self.save_project()
         
     def execute_process(self):
-        self.worker = Worker(self.send_notification_checkbox.isChecked(), self.current_project_path, self.status_label)
+        if self.worker and self.worker.isRunning():
+            return  # The process is already running
+        self.worker = Worker(self.send_notification_checkbox.isChecked(), self.current_project_path)
         self.worker.update_progress.connect(self.update_status)
+        self.worker.finished.connect(self.process_finished)
         self.status_label.setText("Process started...")
+        self.execute_button.setEnabled(False)  # Enabled again when the worker finishes
         self.worker.start()  # Start the worker thread
     
     def update_status(self, message):
         self.status_label.setText(message)
+
+    def process_finished(self):
+        self.execute_button.setEnabled(True)
+        if self.close_when_finished:
+            self.close()
         
     def closeEvent(self, event):
-        # Stop the thread and ensure it exits
-        if self.worker:
-            self.worker.stop()
-            self.worker.join()
+        # Ask the running process to stop and wait for it, so no thread keeps writing to disk
+        # once the window is gone
+        if self.worker and self.worker.isRunning():
+            self.worker._abort.set()
+            if not self.worker.wait(5000):
+                # The thread cannot be killed safely (it may hold the GIL, a logging or a GDAL lock),
+                # so the window stays open and closes itself once the tiles in progress are finished
+                self.close_when_finished = True
+                self.status_label.setText("Stopping the process...")
+                QMessageBox.information(self, "Process running", "The process is stopping. The window will close when the tiles in progress are finished.")
+                event.ignore()
+                return
         super().closeEvent(event)
         
         
@@ -723,19 +814,24 @@ class Worker(QThread):
     # Signal to communicate with the main thread
     update_progress = pyqtSignal(str)
     
-    def __init__(self, send_email, current_project_path, status_label):
+    def __init__(self, send_email, current_project_path):
         super().__init__()
         self.send_email = send_email
         self.current_project_path = current_project_path
-        self.status_label = status_label
+        # Cooperative cancellation, checked by the process before each tile
+        self._abort = threading.Event()
 
     def run(self):
+        # Widgets can only be used from the GUI thread, so the status (and the progress of the tiles) is sent through the signal
         try:
-            if main_process(self.current_project_path, self.send_email):
-                self.status_label.setText('Process successfully completed!')
+            # The processing stack (openEO, GDAL...) is only loaded when a process is executed,
+            # and in this thread, so it does not slow down the start of the GUI
+            from main import main_process
+            if main_process(self.current_project_path, self.send_email, abort=self._abort, progress_cb=self.update_progress.emit):
+                self.update_progress.emit('Process successfully completed!')
         except Exception as e:
             print(e)
-            self.status_label.setText(f'Something went wrong! Check log file for more information.')
+            self.update_progress.emit(f'Something went wrong! Check log file for more information.')
 
 
 if __name__ == "__main__":
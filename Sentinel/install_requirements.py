@@ -1,5 +1,6 @@
 import subprocess
 import sys
+import sysconfig
 import os
 
 def install_wheel(wheel_file):
@@ -47,17 +48,66 @@ def install_requirements(requirements_file='requirements.txt'):
         print(f'Requirements file {requirements_file} does not exist.')
         raise FileNotFoundError(f'{requirements_file} not found.')
 
+def is_wheel_compatible(wheel_file):
+    '''
+    Checks if a wheel file was built for the running interpreter and platform.
+    
+    Args:
+        wheel_file (str): The path to the wheel file (.whl), named {name}-{version}-{python}-{abi}-{platform}.whl.
+    
+    Returns:
+        bool: True if the python and platform tags of the wheel match the interpreter, False otherwise.
+    '''
+    python_tag, _, platform_tag = os.path.basename(wheel_file)[:-len('.whl')].split('-')[-3:]
+    interpreter_tag = f'cp{sys.version_info.major}{sys.version_info.minor}'
+    current_platform = sysconfig.get_platform().replace('-', '_').replace('.', '_')
+    return python_tag == interpreter_tag and platform_tag in (current_platform, 'any')
+
+def install_all(requirements_file='requirements.txt', wheel_file=None):
+    '''
+    Installs the packages of the requirements file and, if given, a wheel file in a single pip invocation.
+    
+    Pip (and its resolver) is only started once, and wheels are preferred over source distributions
+    so packages like GDAL are not built from source if there is a wheel for them.
+    
+    Args:
+        requirements_file (str): The path to the requirements.txt file.
+                                 Defaults to 'requirements.txt'.
+        wheel_file (str): The path to the wheel file (.whl) to be installed with the requirements.
+                          It is skipped if it does not exist or does not match the interpreter. Defaults to None.
+    
+    Raises:
+        subprocess.CalledProcessError: If the installation fails.
+    '''
+    if not os.path.exists(requirements_file):
+        print(f'Requirements file {requirements_file} does not exist.')
+        raise FileNotFoundError(f'{requirements_file} not found.')
+    
+    command = [sys.executable, '-m', 'pip', 'install', '--prefer-binary', '--no-input', '-r', requirements_file]
+    if wheel_file:
+        if not os.path.exists(wheel_file):
+            print(f'Wheel file {wheel_file} does not exist, skipping it.')
+        elif not is_wheel_compatible(wheel_file):
+            print(f'Wheel file {wheel_file} was not built for this interpreter and platform, skipping it.')
+        else:
+            command.append(wheel_file)
+    
+    try:
+        print(f'Installing packages from {requirements_file}...')
+        subprocess.check_call(command)
+        print('Installation complete.')
+    except subprocess.CalledProcessError as e:
+        print(f'Failed to install requirements from {requirements_file}. Error: {e}')
+        raise
+
 # Example usage:
 if __name__ == '__main__':
     wheel_file = 'GDAL-3.4.3-cp311-cp311-win_amd64.whl'  # Replace with your .whl file
     requirements_file = 'requirements.txt'  # Replace with the path to your requirements.txt
     
     try:
-        # Install the wheel file first
-        install_wheel(wheel_file)
-        
-        # Install requirements after the wheel installation
-        install_requirements(requirements_file)
+        # Install the wheel file and the requirements at once
+        install_all(requirements_file, wheel_file)
         
     except Exception as e:
         print(f'An error occurred: {e}')
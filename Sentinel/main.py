@@ -1,9 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import json
 import os
-from typing import Optional
+import threading
+from typing import Callable, Optional
 from dotenv import load_dotenv
-from joblib import Parallel, delayed
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard json module is used if it is not installed
+    orjson = None
 
 
 from src.Sentinel import SentinelTile
@@ -12,58 +17,125 @@ from src.loggers import Logger
 
 from src.utils import get_bbox, get_date_range, build_mosaic
 
-def main_process(project_path:Optional[str] = os.getcwd(), send_email:Optional[bool] = False):
+_settings_cache = {}  # Path -> (modification time, settings) of the config.json files already read
+
+def load_settings(config_file:str) -> dict:
+    """
+    Reads the regions of a project from its config.json file.
+
+    The parsed settings are kept along with the modification time of the file, so running the process
+    again (e.g. from the GUI) only reads the file again if it has been saved since.
+
+    Parameters:
+        config_file (str): The path to the config.json file of the project.
+
+    Returns:
+        dict: The tiles and enhancement data of each region.
+    """
+    mtime = os.stat(config_file).st_mtime_ns
+    cached = _settings_cache.get(config_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(config_file, 'rb') as f:
+        content = f.read()
+    settings = orjson.loads(content) if orjson else json.loads(content)
+    _settings_cache[config_file] = (mtime, settings)
+    return settings
+
+def main_process(project_path:Optional[str] = os.getcwd(), send_email:Optional[bool] = False, abort:Optional[threading.Event] = None, progress_cb:Optional[Callable[[str], None]] = None):
     # Load configurations from the environment file (.env)
     load_dotenv(override=True)
 
     # Configuration settings
     SERVICE_DIR = os.getenv('SERVICE_DIR')
-    MAX_CLOUD_COVER = int(os.getenv('MAX_CLOUD_COVER')) or 5
-    DAYS_OFFSET = int(os.getenv('DAYS_OFFSET')) or 30 # This must be enough so it detects an image with a valid cloud coverage!
+    # Unset or empty values (and zero, as before) fall back to the defaults instead of failing in int(None)
+    MAX_CLOUD_COVER = int(os.getenv('MAX_CLOUD_COVER') or 0) or 5
+    DAYS_OFFSET = int(os.getenv('DAYS_OFFSET') or 0) or 30 # This must be enough so it detects an image with a valid cloud coverage!
     OUTPUT_CRS = os.getenv('OUTPUT_CRS') or 3857
-    THREADS = int(os.getenv('THREADS')) or 2
+    THREADS = int(os.getenv('THREADS') or 0) or 2
     MOSAICKING = (os.getenv('BUILD_MOSAIC') == 'True')
 
     def execute_process(region_name, tile, enhancements):
-        if get_bbox(tile) is not None:
-            sentinel_tile = SentinelTile(
-                region_name=region_name,
-                tile_id=tile,
-                catalog_url='https://catalogue.dataspace.copernicus.eu/stac/',
-                openeo_url='https://openeo.dataspace.copernicus.eu',
-            )
-            
-            sentinel_tile.logger = Logger(logger_name='src.Sentinel', level='DEBUG', handlers=['console', 'file'])
-            sentinel_tile.download_and_enhance_COG(
-                date_range=get_date_range(DAYS_OFFSET),
-                max_cloud_cover=MAX_CLOUD_COVER,
-                output_crs=OUTPUT_CRS,
-                enhancements=enhancements,
-                remove_original=True
-            )
+        # Once the process is aborted (e.g. the GUI is closed) the pending tiles are skipped,
+        # the ones already running finish their current download
+        if abort is not None and abort.is_set():
+            return False
+        sentinel_tile = SentinelTile(
+            region_name=region_name,
+            tile_id=tile,
+            catalog_url='https://catalogue.dataspace.copernicus.eu/stac/',
+            openeo_url='https://openeo.dataspace.copernicus.eu',
+        )
+        
+        sentinel_tile.download_and_enhance_COG(
+            date_range=get_date_range(DAYS_OFFSET),
+            max_cloud_cover=MAX_CLOUD_COVER,
+            output_crs=OUTPUT_CRS,
+            enhancements=enhancements,
+            remove_original=True
+        )
+        return True
     
     # Process each tile in the spanish territory,
     # we run the tileset in a multithread so the process takes less time to complete.
+    # The work is mostly waiting for downloads, so a single pool of threads takes the tiles of every region
     settings = None
     config_file = os.path.join(project_path, 'config.json')
     if os.path.exists(config_file):
-        with open(config_file) as f:
-            settings = json.load(f)
-            for region_name, region in settings.items():
-                Parallel(n_jobs=THREADS)(delayed(execute_process)(region_name, tile, region['enhancement_data']) for tile in region['tiles'])
+        settings = load_settings(config_file)
+        # The handlers of the tiles logger are configured once per run, not by every tile while the others are logging.
+        # It is not done at import time so the log file keeps the date of the run, which is the one attached to the email
+        Logger(logger_name='src.Sentinel', level='DEBUG', handlers=['console', 'file'])
+        # Tiles outside the grid are discarded here, so they are not dispatched to the threads for nothing
+        tasks = [(region_name, tile, region['enhancement_data']) for region_name, region in settings.items() for tile in region['tiles'] if get_bbox(tile) is not None]
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            futures = {executor.submit(execute_process, *task): task for task in tasks}
+            # The progress is reported as each tile finishes, whatever its order
+            done = 0
+            for future in as_completed(futures):
+                try:
+                    processed = future.result()
+                except Exception:
+                    # The first error of the tiles is raised once the running ones finish, as joblib did,
+                    # without processing the tiles that are still queued
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+                if processed:  # The tiles skipped after an abort are not reported as done
+                    done += 1
+                    if progress_cb is not None:
+                        region_name, tile, _ = futures[future]
+                        progress_cb(f'{done}/{len(tasks)}: {region_name}/{tile}')
     
-    if MOSAICKING:
+    # An aborted process does not build the mosaics nor send the email with partial products
+    if abort is not None and abort.is_set():
+        return False
+
+    def build_mosaics(band):
         for resolution in [200, 100, 50]:
-            build_mosaic(f'{SERVICE_DIR}/RGB', 'RGB', resolution)
-            build_mosaic(f'{SERVICE_DIR}/NirGB', 'NirGB', resolution)
-    
-    if send_email:
-        today = datetime.today().strftime('%Y%m%d')
-        # Send an email message once the process has finished
-        email = Email()
-        email.set_subject(os.getenv('SUBJECT'))
-        email.add_content('Se ha completado la actualización del producto Sentinel-2 Máxima Actualidad.\n\nPara más detalles, consulte el fichero adjunto.')
-        for file_name in os.listdir('logs'):
-            if today in file_name:
-                email.attach_file(filename=f'logs/{file_name}')
-        return email.send(smtp_host=os.getenv('SMTP_HOST'), smtp_port=os.getenv('SMTP_PORT'), email_from=os.getenv('FROM'), password=None, email_to=os.getenv('TO'))
\ No newline at end of file
+            build_mosaic(f'{SERVICE_DIR}/{band}', band, resolution)
+
+    # The mosaics of each band are independent, so they are built at the same time,
+    # and the email (with its compressed logs) is prepared meanwhile
+    with ThreadPoolExecutor(max_workers=2) as finalize_pool:
+        mosaics = [finalize_pool.submit(build_mosaics, band) for band in ['RGB', 'NirGB']] if MOSAICKING else []
+
+        email = None
+        if send_email:
+            today = datetime.today().strftime('%Y%m%d')
+            # Send an email message once the process has finished
+            email = Email()
+            email.set_subject(os.getenv('SUBJECT'))
+            email.add_content('Se ha completado la actualización del producto Sentinel-2 Máxima Actualidad.\n\nPara más detalles, consulte el fichero adjunto.')
+            # The logs are named <logger>_<date>.log (and .log.N once rotated), so the date is matched anywhere in the name;
+            # scandir already knows the type of each entry, without a stat per file
+            with os.scandir('logs') as entries:
+                for entry in entries:
+                    if today in entry.name and entry.is_file():
+                        email.attach_file(filename=entry.path, compress=True)
+
+        # The email is only sent once the mosaics are built, and not at all if any of them fails
+        for mosaic in mosaics:
+            mosaic.result()
+
+    if email is not None:
+        return email.send(smtp_host=os.getenv('SMTP_HOST'), smtp_port=os.getenv('SMTP_PORT'), email_from=os.getenv('FROM'), password=None, email_to=os.getenv('TO'))
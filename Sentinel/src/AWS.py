@@ -1,9 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
 import os
+import shutil
 from typing import Optional, Dict, Any
 
 import boto3
 import boto3.utils
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes copied from the socket to the file at a time
+DOWNLOAD_THREADS = 20  # Files of a product downloaded at the same time
+# The files are already downloaded by DOWNLOAD_THREADS threads, so each file is downloaded in the calling thread.
+# Threads for the parts of each file as well would need more connections than the pool has (one per download thread)
+TRANSFER_CONFIG = TransferConfig(use_threads=False)
 
 
 class AWSService():
@@ -45,6 +57,39 @@ class AWSService():
         else:
             self.client_id = client_id
             self.client_secret = client_secret
+
+        # boto3's default session is shared by every thread and is not thread safe, so each service has its own,
+        # and the S3 resource of each endpoint is created once and reused for every product
+        self.boto_session = boto3.session.Session()
+        self.s3_resources: Dict[str, Any] = {}
+        # HTTP session reused by the zipped product downloads, keeping the connections alive and retrying transient errors
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.3))
+        self.http_session.mount('https://', adapter)
+        self.http_session.mount('http://', adapter)
+
+    def get_s3_resource(self, endpoint:str) -> Any:
+        """
+        Gets the S3 resource for the specified endpoint, creating it the first time it is needed.
+
+        Parameters:
+            endpoint (str): The URL of the S3 endpoint.
+
+        Returns:
+            Any: The boto3 S3 resource, which keeps its credentials, service model and connection pool between products.
+        """
+        s3 = self.s3_resources.get(endpoint)
+        if s3 is None:
+            # https://registry.opendata.aws/sentinel-2-l2a-cogs/
+            s3 = self.s3_resources[endpoint] = self.boto_session.resource(
+                's3',
+                endpoint_url=endpoint,
+                aws_access_key_id=self.client_id,
+                aws_secret_access_key=self.client_secret,
+                region_name='default',
+                config=Config(max_pool_connections=DOWNLOAD_THREADS)  # A connection for each download thread
+            )
+        return s3
         
     def get_token(self, client_id:str, token_provider:str, username:Optional[str] = None, password:Optional[str] = None) -> str:
         """
@@ -141,28 +186,30 @@ class AWSService():
                 session_token="your_session_token"
             )
         """
-        # session = boto3.session.Session()
-        # https://registry.opendata.aws/sentinel-2-l2a-cogs/
-        s3 = boto3.resource(
-            's3',
-            endpoint_url=endpoint,
-            aws_access_key_id=self.client_id,
-            aws_secret_access_key=self.client_secret,
-            region_name='default'
-        )
+        s3 = self.get_s3_resource(endpoint)
         
         link = image['assets']['PRODUCT']['alternate']['s3']['href'].strip('/').split('/')
         bucket = s3.Bucket(link.pop(0))
         product = '/'.join(link)
-        files = bucket.objects.filter(Prefix=product)
-        if not list(files):
+        files = list(bucket.objects.filter(Prefix=product))  # Listed once, iterating the collection lists it again
+        if not files:
             raise FileNotFoundError(f"Could not find any files for {product}")
         
+        # The directories are created before the downloads start, so the threads never race to create them
+        downloads = []
         for file in files:
             file_path = os.path.join(output_dir, file.key)
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             if not os.path.isdir(file_path) and not os.path.exists(file_path):
-                bucket.download_file(file.key, file_path)
+                downloads.append((file.key, file_path))
+
+        # A SAFE product has hundreds of small files, so they are downloaded concurrently. Resources are not
+        # thread safe, but their client is, so the threads download through it
+        client = bucket.meta.client
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_THREADS) as executor:
+            results = [executor.submit(client.download_file, bucket.name, key, file_path, Config=TRANSFER_CONFIG) for key, file_path in downloads]
+            for result in results:
+                result.result()  # Raise the errors of the downloads
 
     def download_zipped_raw_products(self, image_metadata: Dict[str, Any], session_token:str, output_dir:Optional[str] = '') -> None:
         """
@@ -182,12 +229,13 @@ class AWSService():
 
         headers = {"Authorization": f"Bearer {session_token}"}
 
-        session = requests.Session()
-        session.headers.update(headers)
-        response = session.get(url, headers=headers, stream=True)
+        response = self.http_session.get(url, headers=headers, stream=True)
+        response.raw.decode_content = True  # Still undo any transfer compression, as iter_content did
 
         file_name = image_metadata['id'].replace('.SAFE', '')
-        with open(f'{output_dir}/{file_name}.zip', 'wb') as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    file.write(chunk)
\ No newline at end of file
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        # The products weigh hundreds of MB, so they are copied straight from the socket in large blocks
+        # (a buffered file is kept: unbuffered writes may be partial, and copyfileobj does not retry them)
+        with response, open(f'{output_dir}/{file_name}.zip', 'wb') as file:
+            shutil.copyfileobj(response.raw, file, length=DOWNLOAD_CHUNK_SIZE)
\ No newline at end of file
@@ -1,9 +1,11 @@
+import gzip
+import io
 import os
-from typing import Optional, List
+import shutil
+import ssl
+from typing import Optional, List, Tuple
 
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
 from smtplib import SMTP, SMTP_SSL
 
 SUBTYPES = ['plain', 'html', 'xml'] # Allowed content subtypes
@@ -13,20 +15,20 @@ class Email():
     A class to create and send email messages with support for multiple content types and attachments.
 
     Attributes:
-        email_message (MIMEMultipart): The main email message container.
+        email_message (EmailMessage): The main email message container.
         subject (str): The subject of the email.
-        contents (List[MIMEText]): A list of MIMEText objects containing the email content.
+        contents (List[Tuple[str, str]]): A list of (text, subtype) tuples containing the email content.
         text_subtype (str): The subtype of the email content (e.g., 'plain', 'html', 'xml').
-        attachments (List[MIMEApplication]): A list of MIMEApplication objects for file attachments.
+        attachments (List[Tuple[str, bytes, str]]): A list of (filename, data, subtype) tuples for file attachments.
     """
     
     def __init__(self) -> None:
         """Initializes an Email instance with default values."""
-        self.email_message: MIMEMultipart = MIMEMultipart()
+        self.email_message: EmailMessage = EmailMessage()
         self.subject:str = ''
-        self.contents:List[MIMEText] = []
+        self.contents:List[Tuple[str, str]] = []
         self.text_subtype:str = 'plain'
-        self.attachments:List[MIMEApplication] = []
+        self.attachments:List[Tuple[str, bytes, str]] = []
     
     def set_subject(self, text:str) -> None:
         """
@@ -68,28 +70,38 @@ class Email():
         Parameters:
             text (str): The text content to be added to the email.
         """
-        msg = MIMEText(text, self.text_subtype)
-        self.contents.append(msg)
+        # The MIME parts are only built once, when the email is sent
+        self.contents.append((text, self.text_subtype))
         
-    def attach_file(self, filename:str):
+    def attach_file(self, filename:str, compress:Optional[bool] = False):
         """
         Attaches a file to the email message.
 
+        Notes:
+        - Compressed files are attached as `<name>.gz` (`application/gzip`). The file is compressed while it is read,
+          so only the compressed data is kept in memory; text files such as logs usually shrink 10-20 times, 
+          which also reduces the base64 encoded message and the data sent to the SMTP server.
+
         Parameters:
             filename (str): The path to the file to be attached.
+            compress (Optional[bool]): Whether to attach the file compressed with gzip. Defaults to False.
 
         Raises:
             FileNotFoundError: If the specified file cannot be found.
         """
         try:
+            name = os.path.basename(filename)
             with open(filename, "rb") as fil:
-                part = MIMEApplication(
-                    fil.read(),
-                    Name=os.path.basename(filename)
-                )
+                if compress:
+                    name = f'{name}.gz'
+                    buffer = io.BytesIO()
+                    with gzip.GzipFile(filename=os.path.basename(filename), mode='wb', fileobj=buffer, compresslevel=6) as gz:
+                        shutil.copyfileobj(fil, gz)
+                    attachment = (name, buffer.getvalue(), 'gzip')
+                else:
+                    attachment = (name, fil.read(), 'octet-stream')
             # After the file is closed
-            part['Content-Disposition'] = f'attachment; filename="{os.path.basename(filename)}"'
-            self.attachments.append(part)
+            self.attachments.append(attachment)
         except FileNotFoundError:
             raise FileNotFoundError(f'[ERROR] The file {filename} was not found.')
     
@@ -98,7 +110,7 @@ class Email():
         Sends the email using the specified SMTP server.
         
         Notes:
-        - If `password` is provided, the SMTP connection will use SSL and TLS encryption. 
+        - If `password` is provided, the SMTP connection will use SSL (implicit TLS, usually port 465). 
         - If `password` is not provided, the connection will default to standard SMTP without encryption.
         - Make sure the `smtp_host` and `smtp_port` are configured correctly, especially if using an external service like Gmail.
         - This function does not support multiple recipients in `email_to`. Only a single recipient address is accepted.
@@ -128,35 +140,41 @@ class Email():
         self.email_message['From'] = email_from
         self.email_message['To'] = email_to
         
-        # Attach content and files
-        for content in self.contents:
-            self.email_message.attach(content)
-        for attachment in self.attachments:
-            self.email_message.attach(attachment)
+        # Build the whole message at once, it is only serialized when it is sent.
+        # The first content is the body, the next ones are added as inline parts as before
+        for i, (text, subtype) in enumerate(self.contents):
+            if i == 0:
+                self.email_message.set_content(text, subtype=subtype)
+            else:
+                self.email_message.add_attachment(text, subtype=subtype, disposition='inline')
+        for name, data, subtype in self.attachments:
+            self.email_message.add_attachment(data, maintype='application', subtype=subtype, filename=name)
         
+        mail_server = None
         try:
+            # The port is usually read from the environment as a string
+            smtp_port = int(smtp_port)
             if password:
                 ## this invokes the secure SMTP protocol (port 465, uses SSL)
-                mail_server = SMTP_SSL(host=smtp_host, port=smtp_port)
-                # Identify ourselves to smtp gmail client
-                mail_server.ehlo()
-                # Secure our email with tls encryption
-                mail_server.starttls()
-                # Re-identify ourselves as an encrypted connection
-                mail_server.ehlo()
+                # The TLS handshake is done when connecting, so there is no STARTTLS (and no second EHLO),
+                # login() sends the EHLO it needs
+                mail_server = SMTP_SSL(host=smtp_host, port=smtp_port, context=ssl.create_default_context(), timeout=30)
                 mail_server.login(email_from, password)
             else:
                 # use this for standard SMTP protocol   (port 25, no encryption)
-                mail_server = SMTP(host=smtp_host, port=smtp_port)
+                mail_server = SMTP(host=smtp_host, port=smtp_port, timeout=30)
             
             mail_server.set_debuglevel(False)
-            mail_server.sendmail(from_addr=self.email_message['From'], to_addrs=self.email_message['To'].strip(' ').split(','), msg=self.email_message.as_string())
+            # The sender and the recipients are taken from the From and To headers
+            mail_server.send_message(self.email_message)
             print(f'Email successfully sent to {email_to}')
             return True
         except Exception as e:
             print(f'[ERROR] {e}')
             return False
         finally:
+            # There is no connection to close if it could not be opened
+            if mail_server is not None:
                 mail_server.quit()
 
 # ¡TEST EMAIL SENDING!
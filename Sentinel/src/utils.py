@@ -1,4 +1,5 @@
 import datetime
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
@@ -147,9 +148,14 @@ def get_season(date_str) -> Dict[str, Dict[str, int]]:
     else:
         return 'Winter'
 
+@lru_cache(maxsize=None)
 def get_bbox(tile_id:str) -> Tuple:
     """
     Get the geometry envelope (bounding box) from a GeoJSON string.
+
+    Notes:
+    - The results are cached, the grid is only read once per tile and the same tile can be
+      checked before the process, while it is processed and in several regions.
     
     Parameters:
         tile_id (str): A string representation of GeoJSON.